@@ -0,0 +1,286 @@
+"""Micro-benchmarks for the portal's hot paths.
+
+    python benchmarks.py extract [page.html ...]
+    python benchmarks.py render
+    python benchmarks.py widgets
+    python benchmarks.py decode [image ...]
+
+Articles come from the cache (news_cache.db, or news_cache_v3.json before
+the first start). Without arguments `extract` downloads their pages; `render`
+needs a display, `widgets` doesn't.
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+import tkinter as tk
+
+import requests
+from bs4 import BeautifulSoup
+from io import BytesIO
+from PIL import Image
+
+import imaging
+import main
+
+
+def legacy_extract(html):
+    """The extractor as it was before extract_article_blocks, kept for comparison."""
+    soup = BeautifulSoup(html, 'html.parser')
+    article = soup.find('div', class_=re.compile('post-body|content|article-body')) or soup.find('article') or soup.find('main')
+    structured = []
+    if not article:
+        return [{'type':'text','content':'Не удалось извлечь содержимое статьи.','style':'error'}]
+    for e in article.find_all(['script','style','nav','header','footer','aside']): e.decompose()
+    for element in article.find_all(['p','h1','h2','h3','img','figure','iframe','div','ul','ol']):
+        if element.name == 'iframe' and 'youtube' in element.get('src',''):
+            structured.append(main._video_block(element.get('src')))
+        elif element.name == 'img':
+            src = element.get('src')
+            if src: structured.append({'type':'img','src':src})
+        elif element.name == 'figure':
+            img = element.find('img')
+            if img and img.get('src'):
+                structured.append({'type':'img','src':img.get('src')})
+                figcap = element.find('figcaption')
+                if figcap and figcap.get_text(strip=True):
+                    structured.append({'type':'text','content':f"[Подпись: {figcap.get_text(strip=True)}]", 'style':'caption'})
+        elif element.name in ['p','h1','h2','h3','ul','ol']:
+            text = element.get_text(strip=True)
+            if text and len(text) > 6:
+                style = 'header' if element.name.startswith('h') else 'normal'
+                structured.append({'type':'text','content':text,'style':style})
+    return structured
+
+
+def cached_articles():
+    """{url: blocks} for every article in the cache."""
+    articles = {}
+    if os.path.exists(main.ARTICLE_DB_FILE):
+        conn = sqlite3.connect(main.ARTICLE_DB_FILE)
+        try:
+            for url, blocks in conn.execute('SELECT url, blocks FROM articles'):
+                articles[url] = json.loads(blocks) if blocks else []
+        except sqlite3.Error:
+            pass
+        conn.close()
+    if not articles and os.path.exists(main.CACHE_FILE):
+        with open(main.CACHE_FILE, 'r', encoding='utf-8') as f:
+            for url, entry in json.load(f).items():
+                articles[url] = entry.get('blocks', []) if isinstance(entry, dict) else entry
+    return articles
+
+
+def load_pages(paths):
+    pages = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append((os.path.basename(path), f.read()))
+    if not paths:
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        for url in cached_articles():
+            try:
+                r = requests.get(url, headers=headers, timeout=15)
+                r.raise_for_status()
+                pages.append((url.rsplit('/', 1)[-1], r.text))
+            except Exception as e:
+                print(f'skip {url}: {e}')
+    return pages
+
+
+def timed(fn, *args, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_extract(args):
+    pages = load_pages(args.pages)
+    if not pages:
+        print('no pages to benchmark')
+        return
+    variants = [('legacy html.parser', legacy_extract)]
+    variants.append(('single-pass html.parser', lambda html: main.extract_article_blocks(html, 'html.parser')))
+    if main.HTML_PARSER == 'lxml':
+        variants.append(('single-pass lxml', lambda html: main.extract_article_blocks(html, 'lxml')))
+    print(f"{'page':<40} {'extractor':<26} {'best ms':>9} {'blocks':>7} {'unique':>7}")
+    for name, html in pages:
+        for label, fn in variants:
+            best, blocks = timed(fn, html, repeat=args.repeat)
+            unique = len({(b['type'], b.get('content') or b.get('src')) for b in blocks})
+            print(f'{name[:40]:<40} {label:<26} {best * 1000:>9.1f} {len(blocks):>7} {unique:>7}')
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def find_scrollable(widget):
+    if isinstance(widget, (tk.Canvas, tk.Text)):
+        return widget
+    for child in widget.winfo_children():
+        found = find_scrollable(child)
+        if found is not None:
+            return found
+    return None
+
+
+class NoImages:
+    """Stand-in for LazyImageLoader that never loads anything."""
+
+    def add(self, key, url, on_ready, on_error):
+        pass
+
+    def reprioritize(self):
+        pass
+
+    def schedule_reprioritize(self, delay=50):
+        pass
+
+
+def bench_render(args):
+    articles = cached_articles()
+    if not articles:
+        print('no cached articles to render')
+        return
+    root = tk.Tk()
+    root.withdraw()
+    app = main.HytaleApp.__new__(main.HytaleApp)
+    app.root = root
+    app.colors = main.HYTALE_STYLE
+    app.photo_cache = main.PhotoCache()
+    app._article_image_loader = lambda window, distance: NoImages()  # layout only, no downloads
+    print(f"{'article':<40} {'renderer':<8} {'blocks':>6} {'widgets':>8} {'open ms':>8} {'scroll ms':>10}")
+    for url, blocks in articles.items():
+        for renderer in ('frames', 'text'):
+            main.ARTICLE_RENDERER = renderer
+            start = time.perf_counter()
+            app._create_news_window('bench', blocks, url)
+            root.update()
+            opened = time.perf_counter() - start
+            window = root.winfo_children()[-1]
+            scrollable = find_scrollable(window)
+            start = time.perf_counter()
+            for _ in range(args.scrolls):
+                scrollable.yview_scroll(1, 'units')
+                root.update()
+            scrolled = time.perf_counter() - start
+            print(f"{url.rsplit('/', 1)[-1][:40]:<40} {renderer:<8} {len(blocks):>6} {count_widgets(window):>8} "
+                  f"{opened * 1000:>8.1f} {scrolled * 1000:>10.1f}")
+            window.destroy()
+    root.destroy()
+
+
+class FakeWidget:
+    """Display-free stand-in for a Tk widget: counts itself and every method call."""
+
+    def __init__(self, master=None, *args, **kwargs):
+        FakeTk.widgets += 1
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            FakeTk.calls += 1
+            return self if name == 'winfo_toplevel' else ''
+        return call
+
+
+class FakeTk:
+    """Replaces main.tk so the renderers run without a display."""
+    widgets = 0
+    calls = 0
+    TclError = tk.TclError
+    Toplevel = Frame = Label = Canvas = Text = Scrollbar = Button = FakeWidget
+
+
+def bench_widgets(args):
+    articles = cached_articles()
+    if not articles:
+        print('no cached articles to render')
+        return
+    app = main.HytaleApp.__new__(main.HytaleApp)
+    app.root = FakeWidget()
+    app.colors = main.HYTALE_STYLE
+    app.photo_cache = main.PhotoCache()
+    app._article_image_loader = lambda window, distance: NoImages()
+    real_tk, main.tk = main.tk, FakeTk
+    totals = {'frames': [0, 0], 'text': [0, 0]}
+    print(f"{'article':<40} {'renderer':<8} {'blocks':>6} {'widgets':>8} {'Tk calls':>9}")
+    try:
+        for url, blocks in articles.items():
+            for renderer in ('frames', 'text'):
+                main.ARTICLE_RENDERER = renderer
+                FakeTk.widgets = FakeTk.calls = 0
+                app._create_news_window('bench', blocks, url)
+                totals[renderer][0] += FakeTk.widgets
+                totals[renderer][1] += FakeTk.calls
+                print(f"{url.rsplit('/', 1)[-1][:40]:<40} {renderer:<8} {len(blocks):>6} {FakeTk.widgets:>8} {FakeTk.calls:>9}")
+    finally:
+        main.tk = real_tk
+    for renderer, (widgets, calls) in totals.items():
+        print(f"{'total':<40} {renderer:<8} {'':>6} {widgets:>8} {calls:>9}")
+
+
+def legacy_decode(data, variant):
+    """Thumbnail/article decode as it was before decode_image."""
+    return imaging.resize_to_variant(Image.open(BytesIO(data)).convert('RGBA'), variant)
+
+
+def synthetic_jpeg(size):
+    img = Image.radial_gradient('L').resize(size).convert('RGB')
+    buf = BytesIO()
+    img.save(buf, format='JPEG', quality=90)
+    return buf.getvalue()
+
+
+def cpu_ms(fn, *args, repeat=10):
+    start = time.process_time()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.process_time() - start) * 1000 / repeat
+
+
+def bench_decode(args):
+    if args.images:
+        samples = []
+        for path in args.images:
+            with open(path, 'rb') as f:
+                data = f.read()
+            samples.append((os.path.basename(path), data, data, main.ARTICLE_VARIANT))
+    else:
+        # Thumbnails: the old path fetched hqdefault (480x360), the new one mqdefault (320x180)
+        samples = [
+            ('thumbnail', synthetic_jpeg((480, 360)), synthetic_jpeg((320, 180)), main.THUMB_VARIANT),
+            ('article 1920x1080 jpeg', synthetic_jpeg((1920, 1080)), synthetic_jpeg((1920, 1080)), main.ARTICLE_VARIANT),
+            ('article 3840x2160 jpeg', synthetic_jpeg((3840, 2160)), synthetic_jpeg((3840, 2160)), main.ARTICLE_VARIANT),
+        ]
+    print(f"{'image':<28} {'variant':<8} {'legacy cpu ms':>14} {'new cpu ms':>11} {'bytes in (old/new)':>20}")
+    for name, old_data, new_data, variant in samples:
+        legacy = cpu_ms(legacy_decode, old_data, variant, repeat=args.repeat)
+        new = cpu_ms(imaging.decode_image, new_data, variant, repeat=args.repeat)
+        print(f'{name[:28]:<28} {variant:<8} {legacy:>14.2f} {new:>11.2f} {len(old_data):>10}/{len(new_data):<9}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='bench', required=True)
+    p = sub.add_parser('extract', help='article extraction: legacy vs single-pass')
+    p.add_argument('pages', nargs='*', help='saved HTML pages (default: download cached articles)')
+    p.add_argument('--repeat', type=int, default=5)
+    p.set_defaults(func=bench_extract)
+    p = sub.add_parser('render', help='article window: Frame+Label per block vs one tk.Text')
+    p.add_argument('--scrolls', type=int, default=100, help='scroll steps timed after opening')
+    p.set_defaults(func=bench_render)
+    p = sub.add_parser('widgets', help='article window widget and Tk call counts per renderer, no display needed')
+    p.set_defaults(func=bench_widgets)
+    p = sub.add_parser('decode', help='per-image CPU time: legacy decode vs draft-mode pipeline')
+    p.add_argument('images', nargs='*', help='image files to decode to the article variant (default: synthetic samples)')
+    p.add_argument('--repeat', type=int, default=10)
+    p.set_defaults(func=bench_decode)
+    args = parser.parse_args()
+    args.func(args)
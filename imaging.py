@@ -0,0 +1,37 @@
+"""Image decoding for the portal's process pool.
+
+Kept apart from main.py so decode workers only import PIL, not the GUI.
+"""
+from io import BytesIO
+
+from PIL import Image
+
+
+def resize_to_variant(img, variant):
+    """Resize a PIL image for a variant name: 'h<N>' fixes the height, 'w<N>' caps the width."""
+    axis, size = variant[0], int(variant[1:])
+    if axis == 'h':
+        return img.resize((int(img.width * (size / img.height)), size), Image.Resampling.LANCZOS)
+    if img.width > size:
+        return img.resize((size, int(img.height * (size / img.width))), Image.Resampling.LANCZOS)
+    return img
+
+
+def decode_image(data, variant):
+    """Decode image bytes straight to a variant; returns (mode, size, pixels) so it can run in a subprocess.
+
+    JPEGs are decoded in draft mode at the smallest 1/2, 1/4 or 1/8 scale that is
+    still at least the target size, and opaque images never get an alpha channel.
+    """
+    img = Image.open(BytesIO(data))
+    axis, size = variant[0], int(variant[1:])
+    if img.format == 'JPEG':
+        if axis == 'h':
+            img.draft('RGB', (max(1, img.width * size // img.height), size))
+        elif img.width > size:
+            img.draft('RGB', (size, max(1, img.height * size // img.width)))
+    if img.mode not in ('RGB', 'RGBA'):
+        has_alpha = img.mode in ('LA', 'PA', 'RGBa', 'La') or 'transparency' in img.info
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+    img = resize_to_variant(img, variant)
+    return img.mode, img.size, img.tobytes()
@@ -1,18 +1,31 @@
 import tkinter as tk
 from tkinter import messagebox, scrolledtext, ttk
 import requests
+from requests.adapters import HTTPAdapter
 import feedparser
 from datetime import datetime
 import threading
 import re
 import webbrowser
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import json
 import os
+import hashlib
+import importlib.util
+import sqlite3
+import queue
+import heapq
+import bisect
 from urllib.parse import quote_plus
 import time
+import random
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 from io import BytesIO
 from PIL import Image, ImageTk
+from imaging import decode_image
 import pygame
 from mutagen import File as MutagenFile                     
 
@@ -20,6 +33,55 @@ from mutagen import File as MutagenFile
 HYTALE_API_URL = "https://hytale.com/api/blog/post/published"
 RELEASE_DATE = datetime(2026, 1, 13, 0, 0, 0)
 CACHE_FILE = "news_cache_v3.json"      
+ARTICLE_DB_FILE = "news_cache.db"
+FEED_SNAPSHOT_FILE = "feed_snapshot.json"  # last post list and videos, painted before the first refresh
+STORE_BATCH_WINDOW = 0.5  # seconds the writer waits to batch commits
+REFRESH_DEADLINE = 20  # seconds for the whole refresh, not per source
+REFRESH_WORKERS = 8
+REFRESH_INTERVAL = 15 * 60          # seconds between scheduled checks of a source, to start with
+REFRESH_MIN_INTERVAL = 5 * 60       # sources that keep changing are checked at most this often
+REFRESH_MAX_INTERVAL = 2 * 60 * 60  # quiet sources at least this often
+REFRESH_SLOWDOWN = 1.5              # interval growth after a check that found nothing new
+REFRESH_RETRY_BASE = 60             # first retry after a failed fetch; doubles per failure
+REFRESH_RETRY_MAX = 60 * 60
+REFRESH_TICK_MS = 15 * 1000         # how often the Tk loop looks for due sources
+REFRESH_IDLE_AFTER = 30 * 60        # no input for this long defers scheduled refreshes
+HTTP_POOL_HOSTS = 16        # hosts kept in the connection pool manager
+HTTP_POOL_SIZE = 8          # keep-alive connections per host
+HTTP_CACHE_BYTES = 32 * 1024 * 1024
+TRANSLATE_TARGET = 'ru'
+TRANSLATION_MEMORY_SIZE = 50000   # rows kept on disk, least recently used pruned at startup
+TRANSLATION_MEMORY_HOT = 5000     # entries also kept in RAM
+TRANSLATE_BATCH_QUERY = 5000  # URL-encoded characters of q per batched googleapis request
+TRANSLATE_WORKERS = 4         # translation requests allowed in flight at once
+TRANSLATE_RATE_LIMITS = {     # backend: (requests per second, burst)
+    'googletrans': (2.0, 2),
+    'googleapis': (5.0, 5),
+}
+TRANSLATE_RETRIES = 3
+IMAGE_CACHE_DIR = "image_cache"
+IMAGE_CACHE_BYTES = 256 * 1024 * 1024
+IMAGE_VARIANT_QUALITY = 90  # JPEG quality of cached opaque variants; PNG only for alpha
+THUMB_VARIANT = 'h84'       # feed thumbnails: fixed height
+ARTICLE_VARIANT = 'w880'    # article images: capped width
+IMAGE_DECODE_PROCESSES = max(1, min(4, (os.cpu_count() or 2) - 1))
+# YouTube thumbnail variants (name, height); default/hqdefault/sddefault are 4:3 with black bars
+YOUTUBE_THUMBS = [('mqdefault', 180), ('maxresdefault', 720)]
+TRACK_INDEX_FILE = 'music_index.json'
+MUSIC_EXTENSIONS = ('.mp3', '.ogg', '.wav', '.flac', '.aac', '.m4a')
+LIBRARY_SNAPSHOT_FILE = 'music_library.json'
+LIBRARY_POLL_INTERVAL = 10  # seconds between background change checks
+TRACK_INDEX_WORKERS = 4
+PLAYER_PUMP_MS = 100        # pygame event pump period on the Tk loop
+PLAYER_POSITION_MS = 250    # minimum gap between position events (seek bar, time labels)
+SEEK_DEBOUNCE_MS = 150      # seek-bar moves within this window collapse into one seek
+MUSIC_END_EVENT = pygame.USEREVENT + 1
+UI_FRAME_MS = 16            # how often the Tk loop drains work posted by other threads
+UI_IDLE_MS = 50             # drain period while nothing is queued
+UI_FRAME_BUDGET_MS = 8      # drain time per frame; the rest waits for the next one
+PHOTO_CACHE_BYTES = 96 * 1024 * 1024  # decoded bitmaps kept in RAM besides those on screen
+ARTICLE_IMAGE_WORKERS = 3   # concurrent image loads per article window
+ARTICLE_RENDERER = 'text'   # 'text': one tk.Text per article, 'frames': a Frame+Label per block
 
 APP_NAME = "KDG Hytale Portal"
 APP_VERSION = "1.2.0-KDG"
@@ -50,6 +112,145 @@ def normalize_youtube_url(url):
         return f'https://www.youtube.com/watch?v={vid}'
     return url
 
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'  # bs4 loads it by name
+
+ARTICLE_CLASS_RE = re.compile('post-body|content|article-body')
+ARTICLE_SKIP_TAGS = {'script', 'style', 'nav', 'header', 'footer', 'aside'}
+ARTICLE_TEXT_TAGS = {'p', 'h1', 'h2', 'h3', 'ul', 'ol'}
+
+
+def _video_block(src):
+    m = re.search(r'(?:v=|/)([0-9A-Za-z_-]{11})', src)
+    if m:
+        return {'type':'video','src':f'https://www.youtube.com/embed/{m.group(1)}'}
+    return {'type':'video','src':src}
+
+
+def extract_article_blocks(html, parser=HTML_PARSER):
+    """Turn a hytale.com post page into content blocks in one document-order walk.
+
+    Only the article subtree is parsed when the page has one (via SoupStrainer);
+    text containers are not descended into, and repeated text or images are
+    emitted once.
+    """
+    soup = BeautifulSoup(html, parser, parse_only=SoupStrainer(class_=ARTICLE_CLASS_RE))
+    article = soup.find('div', class_=ARTICLE_CLASS_RE)
+    if article is None:
+        soup = BeautifulSoup(html, parser)
+        article = soup.find('article') or soup.find('main')
+    if article is None:
+        return [{'type':'text','content':'Не удалось извлечь содержимое статьи.','style':'error'}]
+
+    blocks = []
+    seen = set()
+
+    def emit(block):
+        key = (block['type'], block.get('content') or block.get('src'))
+        if key not in seen:
+            seen.add(key)
+            blocks.append(block)
+
+    def media(el):
+        if el.name == 'iframe':
+            src = el.get('src', '')
+            if 'youtube' in src:
+                emit(_video_block(src))
+        elif el.get('src'):
+            emit({'type':'img','src':el.get('src')})
+
+    stack = [iter(article.children)]
+    while stack:
+        el = next(stack[-1], None)
+        if el is None:
+            stack.pop()
+            continue
+        name = getattr(el, 'name', None)
+        if name is None or name in ARTICLE_SKIP_TAGS:
+            continue
+        if name in ('img', 'iframe'):
+            media(el)
+        elif name == 'figure':
+            img = el.find('img')
+            if img and img.get('src'):
+                emit({'type':'img','src':img.get('src')})
+                figcap = el.find('figcaption')
+                caption = figcap.get_text(strip=True) if figcap else ''
+                if caption:
+                    emit({'type':'text','content':f"[Подпись: {caption}]", 'style':'caption'})
+        elif name in ARTICLE_TEXT_TAGS:
+            text = el.get_text(strip=True)
+            if text and len(text) > 6:
+                emit({'type':'text','content':text,'style':'header' if name.startswith('h') else 'normal'})
+            for inner in el.find_all(['img', 'iframe']):
+                media(inner)
+        else:
+            stack.append(iter(el.children))
+    return blocks
+
+URL_RE = re.compile(r'^(?:https?://|www\.)\S+$', re.IGNORECASE)
+# A single word counts as code only with a real signal: brackets, an assignment, a path
+# separator, snake_case or a dotted identifier like config.json (not 'Update.' or 'Summary:')
+CODE_RE = re.compile(r'[()\[\]{}=/\\]|[A-Za-z0-9]_[A-Za-z0-9]|^[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)+$')
+# Letters used by other Cyrillic-script languages but never by Russian
+NON_RUSSIAN_CYRILLIC = set('іїєґўђјљњћџѕ')
+# Compact character-trigram profiles: the most frequent trigrams of Russian and of its
+# closest Cyrillic neighbours (Ukrainian, Belarusian, Bulgarian) that Russian lacks.
+# The two sets are disjoint; trigrams with letters like і are caught by NON_RUSSIAN_CYRILLIC.
+RUSSIAN_TRIGRAMS = frozenset('ого ени ост ств ова что это ать ани ние ния про пре тор ест ных ный ить ель ами ому'.split())
+OTHER_CYRILLIC_TRIGRAMS = frozenset(['ння', 'ськ', 'цьк', 'ати', 'що ', 'ята', 'щот', 'ият'])
+
+
+def classify_language(text, target=TRANSLATE_TARGET):
+    """Decide without any I/O what to do with a block of text.
+
+    Returns 'target' when it is already in the target language, 'skip' when there
+    is nothing to translate (URLs, numbers, code) and 'translate' otherwise. Only
+    Russian is recognised as a target; other targets always get 'translate'.
+    """
+    stripped = text.strip()
+    if not stripped or URL_RE.match(stripped):
+        return 'skip'
+    letters = [c for c in stripped.lower() if c.isalpha()]
+    if len(letters) < 2:
+        return 'skip'
+    if ' ' not in stripped and CODE_RE.search(stripped):
+        return 'skip'
+    if target != 'ru':
+        return 'translate'
+    cyrillic = sum(1 for c in letters if '\u0400' <= c <= '\u04ff')
+    if cyrillic / len(letters) < 0.6:
+        return 'translate'
+    if any(c in NON_RUSSIAN_CYRILLIC for c in letters):
+        return 'translate'
+    # Russian only writes ъ before е/ё/ю/я; Bulgarian uses it as a vowel
+    if re.search(r'ъ[^еёюя\W]', stripped.lower()):
+        return 'translate'
+    word_text = ' '.join(re.findall(r'[\u0400-\u04ff]+', stripped.lower()))
+    trigrams = [word_text[i:i + 3] for i in range(len(word_text) - 2)]
+    ru = sum(1 for t in trigrams if t in RUSSIAN_TRIGRAMS)
+    other = sum(1 for t in trigrams if t in OTHER_CYRILLIC_TRIGRAMS)
+    return 'translate' if other > ru else 'target'
+
+
+def is_error_blocks(blocks):
+    """True for the placeholder blocks shown when an article couldn't be loaded; never cache these."""
+    return any(b.get('style') == 'error' for b in blocks)
+
+
+def pack_translation_batches(texts, limit=TRANSLATE_BATCH_QUERY):
+    """Group indices of texts so each newline-joined, URL-encoded batch stays under limit."""
+    batches, current, size = [], [], 0
+    for i, text in enumerate(texts):
+        cost = len(quote_plus(text)) + 3  # '%0A' delimiter
+        if current and size + cost > limit:
+            batches.append(current)
+            current, size = [], 0
+        current.append(i)
+        size += cost
+    if current:
+        batches.append(current)
+    return batches
+
 HYTALE_STYLE = {
     'bg': '#030b14',                           
     'card_bg': '#0c1520',                    
@@ -61,7 +262,1412 @@ HYTALE_STYLE = {
     'panel': '#0a1b2a'
 }
 
-                                             
+
+class RefreshScheduler:
+    """Per-source refresh schedule that follows how often each source changes.
+
+    A source whose content changed is checked twice as often next time, one that
+    didn't drifts out by REFRESH_SLOWDOWN, both within REFRESH_MIN_INTERVAL and
+    REFRESH_MAX_INTERVAL. Failures leave the interval alone and retry with
+    exponential backoff from REFRESH_RETRY_BASE with jitter.
+    """
+
+    def __init__(self, sources, interval=REFRESH_INTERVAL):
+        now = time.monotonic()
+        self._lock = threading.Lock()
+        self._state = {source: {'interval': interval, 'due': now + interval, 'failures': 0, 'last': None}
+                       for source in sources}
+
+    def due(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return [source for source, st in self._state.items() if st['due'] <= now]
+
+    def record(self, source, result, error, now=None):
+        """Note one fetch of source and schedule the next; returns True if the result differs from the last one."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            st = self._state[source]
+            if error:
+                st['failures'] += 1
+                delay = min(REFRESH_RETRY_MAX, REFRESH_RETRY_BASE * 2 ** (st['failures'] - 1))
+                st['due'] = now + delay / 2 + random.uniform(0, delay / 2)
+                return False
+            st['failures'] = 0
+            changed = result != st['last']
+            if st['last'] is not None:
+                if changed:
+                    st['interval'] = max(REFRESH_MIN_INTERVAL, st['interval'] / 2)
+                else:
+                    st['interval'] = min(REFRESH_MAX_INTERVAL, st['interval'] * REFRESH_SLOWDOWN)
+            st['last'] = result
+            st['due'] = now + st['interval'] * random.uniform(0.9, 1.1)
+            return changed
+
+
+class HttpClient:
+    """Shared session with per-host keep-alive pools and ETag/Last-Modified revalidation.
+
+    Bodies of responses that carried a validator are kept (LRU, byte budget) so a
+    304 can be answered locally as if the server had sent the full 200 again.
+    """
+
+    def __init__(self, headers=None, pool_hosts=HTTP_POOL_HOSTS, pool_size=HTTP_POOL_SIZE, cache_bytes=HTTP_CACHE_BYTES):
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.headers = self.session.headers
+        self._validated = OrderedDict()
+        self._cache_bytes = 0
+        self._max_bytes = cache_bytes
+        self._lock = threading.Lock()
+        self.not_modified = 0
+
+    def get(self, url, timeout=10, headers=None, conditional=True, **kwargs):
+        req_headers = dict(headers or {})
+        entry = None
+        if conditional:
+            with self._lock:
+                entry = self._validated.get(url)
+                if entry:
+                    self._validated.move_to_end(url)
+            if entry:
+                if entry['etag']:
+                    req_headers['If-None-Match'] = entry['etag']
+                if entry['last_modified']:
+                    req_headers['If-Modified-Since'] = entry['last_modified']
+        r = self.session.get(url, headers=req_headers, timeout=timeout, **kwargs)
+        if r.status_code == 304 and entry:
+            with self._lock:
+                self.not_modified += 1
+            r.status_code = 200
+            r._content = entry['content']
+            r.encoding = entry['encoding']
+            if entry['content_type']:
+                r.headers['Content-Type'] = entry['content_type']
+            r.from_cache = True
+            return r
+        r.from_cache = False
+        if conditional and r.status_code == 200:
+            self._remember(url, r)
+        return r
+
+    def _remember(self, url, r):
+        etag = r.headers.get('ETag')
+        last_modified = r.headers.get('Last-Modified')
+        content = r.content
+        with self._lock:
+            old = self._validated.pop(url, None)
+            if old:
+                self._cache_bytes -= len(old['content'])
+            if not (etag or last_modified) or len(content) > self._max_bytes // 4:
+                return
+            self._validated[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'content': content,
+                'encoding': r.encoding,
+                'content_type': r.headers.get('Content-Type'),
+            }
+            self._cache_bytes += len(content)
+            while self._cache_bytes > self._max_bytes and self._validated:
+                _, dropped = self._validated.popitem(last=False)
+                self._cache_bytes -= len(dropped['content'])
+
+    def close(self):
+        self.session.close()
+
+
+def youtube_thumb_url(vid, target_h):
+    """Smallest letterbox-free YouTube thumbnail at least target_h pixels high."""
+    for name, height in YOUTUBE_THUMBS:
+        if height >= target_h:
+            break
+    return f'https://img.youtube.com/vi/{vid}/{name}.jpg'
+
+
+class ImageCache:
+    """On-disk image store keyed by URL hash: originals plus resized variants, LRU within a byte budget."""
+
+    def __init__(self, directory, max_bytes=IMAGE_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # file name -> size, least recently used first
+        self._total = 0
+        try:
+            os.makedirs(directory, exist_ok=True)
+            found = []
+            for entry in os.scandir(directory):
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    st = entry.stat()
+                    found.append((st.st_mtime, entry.name, st.st_size))
+            for _, name, size in sorted(found):
+                self._entries[name] = size
+                self._total += size
+        except Exception as e:
+            print('Image cache unavailable:', e)
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _read(self, name):
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # mtime doubles as the LRU clock across restarts
+            return data
+        except OSError:
+            with self._lock:
+                self._total -= self._entries.pop(name, 0)
+            return None
+
+    def _write(self, name, data):
+        path = os.path.join(self.directory, name)
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print('Image cache write failed:', e)
+            return
+        evict = []
+        with self._lock:
+            self._total -= self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._total += len(data)
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                old, size = self._entries.popitem(last=False)
+                self._total -= size
+                evict.append(old)
+        for old in evict:
+            try:
+                os.remove(os.path.join(self.directory, old))
+            except OSError:
+                pass
+
+    def get_original(self, url):
+        return self._read(f'{self.key(url)}.orig')
+
+    def put_original(self, url, data):
+        self._write(f'{self.key(url)}.orig', data)
+
+    def get_variant(self, url, variant):
+        name = f'{self.key(url)}_{variant}'
+        data = self._read(f'{name}.jpg') or self._read(f'{name}.png')
+        if data is None:
+            return None
+        try:
+            img = Image.open(BytesIO(data))
+            img.load()
+            return img
+        except Exception:
+            return None
+
+    def put_variant(self, url, variant, img):
+        """Store a resized variant: JPEG for opaque images (a PNG of a photo costs several times
+        its decode to encode), PNG only when the alpha channel is actually used."""
+        buf = BytesIO()
+        if img.mode == 'RGBA' and img.getchannel('A').getextrema()[0] < 255:
+            img.save(buf, format='PNG')
+            ext = 'png'
+        else:
+            img.convert('RGB').save(buf, format='JPEG', quality=IMAGE_VARIANT_QUALITY)
+            ext = 'jpg'
+        self._write(f'{self.key(url)}_{variant}.{ext}', buf.getvalue())
+
+    def clear(self):
+        with self._lock:
+            names = list(self._entries)
+            self._entries.clear()
+            self._total = 0
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class ArticleStore:
+    """SQLite (WAL) store with one row per article URL and a write-behind queue.
+
+    Writers only enqueue; a single background thread commits whatever has queued
+    up within STORE_BATCH_WINDOW in one transaction. Rows still waiting in the
+    queue are served from memory so readers always see their own writes, and
+    leave memory only once their write committed (or was given up on).
+    """
+
+    def __init__(self, path, legacy_json=None):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS articles ('
+                               'url TEXT PRIMARY KEY, blocks TEXT, translated TEXT, updated REAL)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self._pending = {}  # url -> (generation, entry) not committed yet
+        self._generation = 0  # bumped by clear(); older pending entries are hidden
+        self._clearing = 0  # clear() DELETEs still queued
+        self._queue = queue.Queue()
+        if legacy_json:
+            self._migrate_json(legacy_json)
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _migrate_json(self, legacy_json):
+        """One-time import of the old monolithic news_cache_v3.json."""
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM meta WHERE key='legacy_json_migrated'").fetchone():
+                return
+        rows = []
+        if os.path.exists(legacy_json):
+            try:
+                with open(legacy_json, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for url, entry in data.items():
+                    if isinstance(entry, list):
+                        entry = {'blocks': entry}
+                    if isinstance(entry, dict) and entry.get('blocks'):
+                        translated = entry.get('translated')
+                        rows.append((url, json.dumps(entry['blocks'], ensure_ascii=False),
+                                     json.dumps(translated, ensure_ascii=False) if translated else None, time.time()))
+            except Exception as e:
+                print(f"Ошибка миграции кэша: {e}")
+        with self._lock:
+            self._conn.execute('BEGIN')
+            self._conn.executemany('INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?)', rows)
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('legacy_json_migrated', ?)", (str(len(rows)),))
+            self._conn.execute('COMMIT')
+
+    def get(self, url):
+        """Return {'blocks': [...], 'translated': [...] or None} or None when the URL is unknown."""
+        with self._lock:
+            return self._get_locked(url)
+
+    def _get_locked(self, url):
+        pending = self._pending.get(url)
+        if pending is not None and pending[0] == self._generation:
+            return dict(pending[1])
+        if self._clearing:
+            return None  # the rows on disk are about to be deleted
+        row = self._conn.execute('SELECT blocks, translated FROM articles WHERE url=?', (url,)).fetchone()
+        if not row:
+            return None
+        return {'blocks': json.loads(row[0]) if row[0] else None,
+                'translated': json.loads(row[1]) if row[1] else None}
+
+    def put(self, url, blocks=None, translated=None):
+        """Queue an upsert; fields left as None keep their stored value."""
+        with self._lock:
+            current = self._get_locked(url) or {'blocks': None, 'translated': None}
+            entry = {'blocks': blocks if blocks is not None else current['blocks'],
+                     'translated': translated if translated is not None else current['translated']}
+            marker = self._pending[url] = (self._generation, entry)
+        self.execute('INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?)',
+                     (url,
+                      json.dumps(entry['blocks'], ensure_ascii=False) if entry['blocks'] is not None else None,
+                      json.dumps(entry['translated'], ensure_ascii=False) if entry['translated'] is not None else None,
+                      time.time()),
+                     pending=(url, marker))
+
+    def execute(self, sql, params=(), pending=None):
+        """Queue a write statement for the next batched commit."""
+        self._queue.put((sql, params, pending))
+
+    def query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def clear(self):
+        """Queue deleting every article; reads see an empty store right away."""
+        with self._lock:
+            self._generation += 1
+            self._clearing += 1
+            generation = self._generation
+        self.execute('DELETE FROM articles', pending=(None, generation))
+
+    def flush(self, timeout=5):
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        with self._lock:
+            self._conn.close()
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + STORE_BATCH_WINDOW
+            while batch[-1] is not None and not isinstance(batch[-1], threading.Event):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            writes = [item for item in batch if isinstance(item, tuple)]
+            failed = writes if writes and not self._commit(writes) else []
+            if len(failed) > 1:
+                # One bad statement rolled back the whole batch; retry the writes one by one
+                failed = [write for write in failed if not self._commit([write])]
+            if failed:
+                print(f"Ошибка сохранения кэша: отброшено записей: {len(failed)}")
+                with self._lock:
+                    self._release(failed)  # serve what the database holds instead
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if batch[-1] is None:
+                return
+
+    def _commit(self, writes):
+        """Run writes in one transaction; True once committed, False after a rollback."""
+        try:
+            with self._lock:
+                self._conn.execute('BEGIN')
+                for sql, params, _ in writes:
+                    self._conn.execute(sql, params)
+                self._conn.execute('COMMIT')
+                self._release(writes)
+            return True
+        except Exception as e:
+            print(f"Ошибка сохранения кэша: {e}")
+            with self._lock:
+                if self._conn.in_transaction:
+                    self._conn.execute('ROLLBACK')
+            return False
+
+    def _release(self, writes):
+        """Drop the pending entries of finished writes unless they were replaced since. Caller holds _lock."""
+        for _, _, pending in writes:
+            if not pending:
+                continue
+            url, marker = pending
+            if url is None:  # clear(): whatever was pending before it is gone too
+                self._pending = {u: p for u, p in self._pending.items() if p[0] >= marker}
+                self._clearing -= 1
+            elif self._pending.get(url) is marker:
+                del self._pending[url]
+
+
+class TranslationMemory:
+    """Source text -> translation, keyed by hash of the whitespace-normalized text and target language.
+
+    Lives in the article store's database so it shares its batched writer; a
+    small LRU in RAM in front avoids a query for strings repeated within a page.
+    """
+
+    def __init__(self, store, lang=TRANSLATE_TARGET, max_entries=TRANSLATION_MEMORY_SIZE, hot_entries=TRANSLATION_MEMORY_HOT):
+        self.store = store
+        self.lang = lang
+        self.max_entries = max_entries
+        self.hot_entries = hot_entries
+        self._hot = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        store.query('CREATE TABLE IF NOT EXISTS translations ('
+                    'key TEXT PRIMARY KEY, lang TEXT, text TEXT, used REAL)')
+        store.execute('DELETE FROM translations WHERE key NOT IN '
+                      '(SELECT key FROM translations ORDER BY used DESC LIMIT ?)', (max_entries,))
+
+    def key(self, text):
+        normalized = ' '.join(text.split())
+        return hashlib.sha1(f'{self.lang}\0{normalized}'.encode('utf-8')).hexdigest()
+
+    def get(self, text):
+        key = self.key(text)
+        with self._lock:
+            if key in self._hot:
+                self._hot.move_to_end(key)
+                self.hits += 1
+                return self._hot[key]
+        rows = self.store.query('SELECT text FROM translations WHERE key=?', (key,))
+        with self._lock:
+            if not rows:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, rows[0][0])
+        self.store.execute('UPDATE translations SET used=? WHERE key=?', (time.time(), key))
+        return rows[0][0]
+
+    def put(self, text, translated):
+        # An unchanged result is what every backend returns on failure; never remember it
+        if not translated or translated == text:
+            return
+        key = self.key(text)
+        with self._lock:
+            self._remember(key, translated)
+        self.store.execute('INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)',
+                           (key, self.lang, translated, time.time()))
+
+    def _remember(self, key, translated):
+        self._hot[key] = translated
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_entries:
+            self._hot.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return self.hits, self.misses
+
+    def clear(self):
+        with self._lock:
+            self._hot.clear()
+        self.store.execute('DELETE FROM translations')
+
+
+class TokenBucket:
+    """Token bucket rate limiter; acquire() blocks until a token is available."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class TranslationExecutor:
+    """Bounded worker pool for translation calls with a rate limit per backend.
+
+    call() throttles and retries a single request in the calling thread; map()
+    fans work out to the pool and returns results in input order.
+    """
+
+    def __init__(self, workers=TRANSLATE_WORKERS, limits=TRANSLATE_RATE_LIMITS, retries=TRANSLATE_RETRIES):
+        self.workers = workers
+        self.limits = limits
+        self.retries = retries
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='translate')
+        self._buckets = {name: TokenBucket(rate, burst) for name, (rate, burst) in limits.items()}
+
+    def call(self, backend, fn, *args, **kwargs):
+        """Run fn under backend's rate limit, retrying failures with jittered exponential backoff."""
+        for attempt in range(self.retries + 1):
+            self._buckets[backend].acquire()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(min(8.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.5))
+
+    def map(self, fn, items, on_result=None):
+        """Run fn over items in parallel; on_result(index, result) fires as each one finishes."""
+        futures = {self._pool.submit(fn, item): i for i, item in enumerate(items)}
+        results = [None] * len(futures)
+        for fut in as_completed(futures):
+            i = futures[fut]
+            try:
+                results[i] = fut.result()
+            except Exception as e:
+                results[i] = e
+            if on_result:
+                on_result(i, results[i])
+        return results
+
+    def describe(self):
+        rates = ', '.join(f'{name} {rate:g}/с' for name, (rate, _) in self.limits.items())
+        return f'{self.workers} потока · {rates}'
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class PrefetchCancelled(Exception):
+    """Raised by ArticlePrefetcher.checkpoint() once the article being prepared was claimed."""
+
+
+class ArticlePrefetcher:
+    """Low-priority background queue that prepares articles before they are opened.
+
+    One daemon thread handles one article at a time with work(url, checkpoint).
+    hold()/release() bracket anything the user is waiting for: the worker
+    doesn't start an article, and work() blocks in checkpoint() between its
+    steps, while anything is held. Claiming the article being prepared cancels
+    it at its next checkpoint.
+    """
+
+    def __init__(self, work):
+        self.work = work
+        self._cond = threading.Condition()
+        self._queue = []
+        self._holds = 0
+        self._current = None
+        self._cancelled = False
+        threading.Thread(target=self._run, daemon=True, name='prefetch').start()
+
+    def submit(self, urls):
+        with self._cond:
+            for url in urls:
+                if url != self._current and url not in self._queue:
+                    self._queue.append(url)
+            self._cond.notify_all()
+
+    def claim(self, url):
+        """Take url off the queue, or cancel it if it's being prepared right now; the caller does the work."""
+        with self._cond:
+            if url in self._queue:
+                self._queue.remove(url)
+            if url == self._current:
+                self._cancelled = True
+                self._cond.notify_all()
+
+    def hold(self):
+        with self._cond:
+            self._holds += 1
+
+    def release(self):
+        with self._cond:
+            self._holds -= 1
+            self._cond.notify_all()
+
+    def checkpoint(self):
+        with self._cond:
+            while self._holds and not self._cancelled:
+                self._cond.wait()
+            if self._cancelled:
+                raise PrefetchCancelled()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue or self._holds:
+                    self._cond.wait()
+                url = self._current = self._queue.pop(0)
+                self._cancelled = False
+            try:
+                self.work(url, self.checkpoint)
+            except PrefetchCancelled:
+                pass
+            except Exception as e:
+                print(f'Prefetch failed for {url}: {e}')
+            finally:
+                with self._cond:
+                    self._current = None
+
+
+class UiDispatcher:
+    """Hands work from any thread to the Tk thread without touching Tk off it.
+
+    post(fn) only appends to a locked queue. The drain timer lives on the Tk
+    thread: it runs every UI_FRAME_MS for at most UI_FRAME_BUDGET_MS while work
+    is queued, and slows down to UI_IDLE_MS once the queue is empty. Posts with
+    a key replace a pending post with the same key and move to the back of the
+    queue, so e.g. a burst of status texts only paints the latest one, in order.
+    """
+
+    def __init__(self, root, frame_ms=UI_FRAME_MS, budget_ms=UI_FRAME_BUDGET_MS, idle_ms=UI_IDLE_MS):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.idle_ms = idle_ms
+        self.budget = budget_ms / 1000
+        self._lock = threading.Lock()
+        self._queue = deque()  # [fn, key] entries; fn is None once replaced
+        self._keyed = {}       # key -> its pending entry
+        self._closed = False
+        root.after(frame_ms, self._drain)
+
+    def post(self, fn, key=None):
+        with self._lock:
+            if self._closed:
+                return
+            if key is not None:
+                old = self._keyed.get(key)
+                if old is not None:
+                    old[0] = old[1] = None  # _drain skips it
+                entry = self._keyed[key] = [fn, key]
+            else:
+                entry = [fn, None]
+            self._queue.append(entry)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+
+    def _drain(self):
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            with self._lock:
+                if self._closed or not self._queue:
+                    break
+                fn, key = self._queue.popleft()
+                if key is not None:
+                    del self._keyed[key]
+            if fn is None:
+                continue
+            try:
+                fn()
+            except Exception as e:
+                print(f'UI task failed: {e}')
+        with self._lock:
+            if self._closed:
+                return
+            busy = bool(self._queue)
+        self.root.after(self.frame_ms if busy else self.idle_ms, self._drain)
+
+
+class LazyImageLoader:
+    """Loads the images of one window with a few workers, nearest to the viewport first.
+
+    distance(key) runs on the Tk thread (it may read widget geometry) whenever
+    reprioritize() is called, e.g. after a scroll; workers only see the resulting
+    heap, and hand results back through post (UiDispatcher.post). Destroying the
+    window drops everything still pending.
+    """
+
+    def __init__(self, window, load, distance, post, workers=ARTICLE_IMAGE_WORKERS):
+        self.window = window
+        self._load = load
+        self._post = post
+        self._distance = distance
+        self._items = {}
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._reprioritize_pending = False
+        self._workers = workers
+        self._started = False
+        window.bind('<Destroy>', self._on_destroy, add='+')
+
+    def add(self, key, url, on_ready, on_error):
+        """Queue url; on_ready(result) or on_error(exc) later runs on the Tk thread.
+
+        Until the first reprioritize() items are served in the order they were added.
+        """
+        with self._cond:
+            self._items[key] = (url, on_ready, on_error)
+            self._seq += 1
+            heapq.heappush(self._heap, (0, self._seq, key))
+            self._cond.notify()
+            start, self._started = not self._started, True
+        if start:
+            # Workers start with the first image, so articles without any cost no threads
+            for _ in range(self._workers):
+                threading.Thread(target=self._work, daemon=True).start()
+
+    def schedule_reprioritize(self, delay=50):
+        """Coalesce bursts of scroll events into one reprioritize() call."""
+        if self._reprioritize_pending or self._closed:
+            return
+        self._reprioritize_pending = True
+        self.window.after(delay, self.reprioritize)
+
+    def reprioritize(self):
+        self._reprioritize_pending = False
+        with self._cond:
+            keys = list(self._items)
+        try:
+            ranked = [(self._distance(key), key) for key in keys]
+        except tk.TclError:
+            return
+        with self._cond:
+            self._heap = []
+            for dist, key in ranked:
+                if key in self._items:
+                    self._seq += 1
+                    self._heap.append((dist, self._seq, key))
+            heapq.heapify(self._heap)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._items.clear()
+            self._heap.clear()
+            self._cond.notify_all()
+
+    def _on_destroy(self, event):
+        if event.widget is self.window:
+            self.close()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._closed and not self._heap:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                _, _, key = heapq.heappop(self._heap)
+                item = self._items.pop(key, None)
+            if item is None:
+                continue
+            url, on_ready, on_error = item
+            try:
+                result = self._load(url)
+                callback = lambda cb=on_ready, result=result: cb(result)
+            except Exception as e:
+                callback = lambda cb=on_error, e=e: cb(e)
+            if self._closed:
+                return
+            self._post(lambda cb=callback: None if self._closed else cb())
+
+
+class PhotoCache:
+    """Decoded PhotoImages keyed by (url, variant), LRU within a byte budget.
+
+    Every entry remembers which owners (a window or feed row) display it. Owned
+    entries are never evicted; when an owner is destroyed its pins are released
+    and the entries become ordinary LRU candidates. Tk thread only.
+    """
+
+    def __init__(self, max_bytes=PHOTO_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> [photo, bytes, owners]
+        self._total = 0
+        self._owners = set()
+
+    def get(self, key, owner=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        self._pin(entry, owner)
+        return entry[0]
+
+    def put(self, key, img, owner=None):
+        """Cache img as a PhotoImage; if another loader got there first, share its photo."""
+        existing = self.get(key, owner)
+        if existing is not None:
+            return existing  # replacing it would let Tk delete the image the first owner shows
+        photo = ImageTk.PhotoImage(img)
+        entry = [photo, img.width * img.height * 4, set()]
+        self._entries[key] = entry
+        self._total += entry[1]
+        self._pin(entry, owner)
+        self._evict()
+        return photo
+
+    def _pin(self, entry, owner):
+        if owner is None:
+            return
+        name = str(owner)
+        entry[2].add(name)
+        if name not in self._owners:
+            self._owners.add(name)
+            owner.bind('<Destroy>', lambda e: e.widget is owner and self.release(name), add='+')
+
+    def release(self, name):
+        self._owners.discard(name)
+        for entry in self._entries.values():
+            entry[2].discard(name)
+        self._evict()
+
+    def _evict(self):
+        for key in list(self._entries):
+            if self._total <= self.max_bytes:
+                break
+            entry = self._entries[key]
+            if not entry[2]:
+                del self._entries[key]
+                self._total -= entry[1]
+
+
+class FeedSection:
+    """Keyed rows of one feed container, reconciled against fresh data instead of rebuilt.
+
+    build(item) creates and packs one row widget. reconcile() destroys rows
+    whose key disappeared, rebuilds only rows whose item changed, builds new
+    ones and re-packs rows whose order changed; an unchanged list touches no
+    widgets at all. Tk thread only.
+    """
+
+    def __init__(self, container, build):
+        self.container = container
+        self.build = build
+        self.rows = {}   # key -> (row widget, item)
+        self.order = []  # keys in display order
+        self._error = None
+
+    def reconcile(self, items):
+        """items: [(key, item)] in display order; returns True if anything on screen changed."""
+        keys = [key for key, _ in items]
+        changed = self._clear_error()
+        for key in set(self.rows) - set(keys):
+            self.rows.pop(key)[0].destroy()
+            changed = True
+        rebuilt = set()
+        for key, item in items:
+            entry = self.rows.get(key)
+            if entry is not None and entry[1] == item:
+                continue
+            if entry is not None:
+                entry[0].destroy()
+            self.rows[key] = (self.build(item), item)
+            rebuilt.add(key)
+            changed = True
+        shown = [key for key in self.order if key in self.rows and key not in rebuilt]
+        if rebuilt or shown != keys:
+            prev = None
+            for key in keys:
+                row = self.rows[key][0]
+                if prev is None:
+                    first = self.container.pack_slaves()
+                    if first and first[0] is not row:
+                        row.pack_configure(before=first[0])
+                else:
+                    row.pack_configure(after=prev)
+                prev = row
+        self.order = keys
+        return changed
+
+    def show_error(self, msg, make):
+        """Show an error via make(container, msg), but only while there are no rows to keep showing."""
+        if self.rows:
+            return
+        self._clear_error()
+        make(self.container, msg)
+        self._error = self.container.pack_slaves()[-1]
+
+    def _clear_error(self):
+        if self._error is None:
+            return False
+        self._error.destroy()
+        self._error = None
+        return True
+
+
+def read_track_metadata(path):
+    """Duration, bitrate and title/artist tags of one audio file (parses the file with mutagen)."""
+    audio = MutagenFile(path, easy=True)
+    info = getattr(audio, 'info', None)
+    meta = {
+        'duration_ms': int((getattr(info, 'length', 0) or 0) * 1000),
+        'bitrate': int(getattr(info, 'bitrate', 0) or 0),
+        'title': None,
+        'artist': None,
+    }
+    tags = getattr(audio, 'tags', None)
+    if tags:
+        for field in ('title', 'artist'):
+            try:
+                values = tags.get(field)
+            except Exception:
+                values = None
+            if values:
+                meta[field] = str(values[0] if isinstance(values, list) else values)
+    return meta
+
+
+class TrackIndex:
+    """Track metadata kept in memory and persisted to disk, keyed by path and validated by mtime+size.
+
+    ensure() fills it in the background with a thread pool; lookups never touch
+    the file again once a track is indexed.
+    """
+
+    def __init__(self, path, workers=TRACK_INDEX_WORKERS):
+        self.path = path
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._entries = {}
+        try:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._entries = data
+        except Exception as e:
+            print('Failed to load track index:', e)
+
+    def get(self, path):
+        with self._lock:
+            return self._entries.get(path)
+
+    def lookup(self, path):
+        """Indexed metadata for path, reading the file once if it isn't indexed yet."""
+        entry = self.get(path)
+        if entry is None:
+            entry = self._index(path)
+        return entry or {}
+
+    def duration_ms(self, path):
+        return self.lookup(path).get('duration_ms', 0)
+
+    def ensure(self, paths, on_done=None):
+        """Index every stale or missing path in the background, then save once."""
+        def run():
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                changed = sum(1 for entry in pool.map(self._refresh, list(paths)) if entry)
+            if changed:
+                self.save()
+            if on_done:
+                on_done()
+        threading.Thread(target=run, daemon=True).start()
+
+    def _refresh(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        entry = self.get(path)
+        if entry and entry.get('mtime') == st.st_mtime and entry.get('size') == st.st_size:
+            return None
+        return self._index(path, st)
+
+    def _index(self, path, st=None):
+        try:
+            st = st or os.stat(path)
+        except OSError:
+            return None
+        try:
+            entry = read_track_metadata(path)
+        except Exception as e:
+            # Cache the failure too, so the file is parsed again only once it changes
+            print(f'Failed to read track metadata for {path}: {e}')
+            entry = {'duration_ms': 0, 'bitrate': 0, 'title': None, 'artist': None, 'failed': True}
+        entry['mtime'] = st.st_mtime
+        entry['size'] = st.st_size
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+    def forget(self, paths):
+        with self._lock:
+            for path in paths:
+                self._entries.pop(path, None)
+
+    def save(self):
+        with self._lock:
+            data = dict(self._entries)
+        try:
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print('Failed to save track index:', e)
+
+
+class MusicLibraryScanner:
+    """Recursive music folder scanner that reports what was added and removed.
+
+    The snapshot keeps every directory's mtime with its audio files and
+    subdirectories. Adding, removing or renaming an entry bumps the mtime of the
+    directory holding it, so a rescan only re-lists directories whose mtime
+    changed and just stats the rest.
+    """
+
+    def __init__(self, root, snapshot_path, on_delta=None, interval=LIBRARY_POLL_INTERVAL):
+        self.root = root
+        self.snapshot_path = snapshot_path
+        self.on_delta = on_delta
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._dirs = {}
+        try:
+            if os.path.exists(snapshot_path):
+                with open(snapshot_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get('root') == root:
+                    self._dirs = data.get('dirs', {})
+        except Exception as e:
+            print('Failed to load music library snapshot:', e)
+
+    def files(self):
+        with self._lock:
+            return sorted(f for entry in self._dirs.values() for f in entry['files'])
+
+    def scan(self):
+        """Bring the snapshot up to date; returns (added, removed) lists of paths."""
+        with self._lock:
+            old = self._dirs
+        new = {}
+        pending = [self.root]
+        while pending:
+            directory = pending.pop()
+            try:
+                mtime = os.stat(directory).st_mtime
+            except OSError:
+                continue
+            entry = old.get(directory)
+            if entry is None or entry['mtime'] != mtime:
+                entry = {'mtime': mtime, 'files': [], 'dirs': []}
+                try:
+                    with os.scandir(directory) as it:
+                        for item in it:
+                            if item.is_dir(follow_symlinks=False):
+                                entry['dirs'].append(item.path)
+                            elif item.name.lower().endswith(MUSIC_EXTENSIONS):
+                                entry['files'].append(item.path)
+                except OSError as e:
+                    print('Error scanning music folder:', e)
+                    continue
+            new[directory] = entry
+            pending.extend(entry['dirs'])
+        old_files = {f for entry in old.values() for f in entry['files']}
+        new_files = {f for entry in new.values() for f in entry['files']}
+        added = sorted(new_files - old_files)
+        removed = sorted(old_files - new_files)
+        with self._lock:
+            self._dirs = new
+        if added or removed or new.keys() != old.keys():
+            self._save(new)
+        return added, removed
+
+    def _save(self, dirs):
+        try:
+            tmp = self.snapshot_path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'root': self.root, 'dirs': dirs}, f, ensure_ascii=False)
+            os.replace(tmp, self.snapshot_path)
+        except Exception as e:
+            print('Failed to save music library snapshot:', e)
+
+    def start(self):
+        """Poll for changes in a daemon thread, calling on_delta(added, removed) when something changed."""
+        def run():
+            while True:
+                time.sleep(self.interval)
+                added, removed = self.scan()
+                if (added or removed) and self.on_delta:
+                    self.on_delta(added, removed)
+        threading.Thread(target=run, daemon=True).start()
+
+
+def sync_listbox(listbox, old, new):
+    """Turn a Listbox showing rows `old` into one showing `new`, touching only rows that differ."""
+    start = 0
+    while start < len(old) and start < len(new) and old[start] == new[start]:
+        start += 1
+    end_old, end_new = len(old), len(new)
+    while end_old > start and end_new > start and old[end_old - 1] == new[end_new - 1]:
+        end_old -= 1
+        end_new -= 1
+    common = min(end_old, end_new) - start
+    for i in range(start, start + common):
+        if old[i] != new[i]:
+            listbox.delete(i)
+            listbox.insert(i, new[i])
+    if end_old > start + common:
+        listbox.delete(start + common, end_old - 1)
+    elif end_new > start + common:
+        listbox.insert(start + common, *new[start + common:end_new])
+
+
+class Playlist:
+    """Sorted track list with a path -> position index, favorites kept in track order,
+    and a token index for filter-as-you-type search.
+
+    describe(path) gives the searchable text of a track (file name and tags);
+    call retokenize() when it changes, e.g. once the track index has read tags.
+    """
+
+    def __init__(self, describe=None):
+        self.tracks = []
+        self.favorites = set()
+        self._describe = describe or (lambda path: os.path.basename(path))
+        self._lock = threading.RLock()
+        self._pos = {}
+        self._fav_tracks = []   # favorites present in the library, in track order
+        self._tokens = {}       # token -> set of paths
+        self._path_tokens = {}  # path -> tokens
+        self._token_list = []   # sorted tokens for prefix lookups
+        self._tokens_dirty = False
+
+    @staticmethod
+    def tokenize(text):
+        return set(re.findall(r'\w+', text.lower()))
+
+    def reset(self, paths):
+        with self._lock:
+            self.tracks[:] = sorted(set(paths))
+            self._tokens.clear()
+            self._path_tokens.clear()
+            self._reindex()
+            self._index_tokens(self.tracks)
+
+    def add(self, paths):
+        with self._lock:
+            for path in paths:
+                pos = bisect.bisect_left(self.tracks, path)
+                if pos >= len(self.tracks) or self.tracks[pos] != path:
+                    self.tracks.insert(pos, path)
+            self._reindex()
+            self._index_tokens(paths)
+
+    def remove(self, paths):
+        with self._lock:
+            gone = set(paths)
+            self.tracks[:] = [p for p in self.tracks if p not in gone]
+            for path in gone:
+                self._drop_tokens(path)
+            self._reindex()
+
+    def index_of(self, path):
+        return self._pos.get(path)
+
+    def set_favorites(self, paths):
+        with self._lock:
+            self.favorites.clear()
+            self.favorites.update(paths)
+            self._fav_tracks = [p for p in self.tracks if p in self.favorites]
+
+    def toggle_favorite(self, path):
+        """Flip path's favorite flag; returns the new state."""
+        with self._lock:
+            pos = bisect.bisect_left(self._fav_tracks, path)
+            if path in self.favorites:
+                self.favorites.discard(path)
+                if pos < len(self._fav_tracks) and self._fav_tracks[pos] == path:
+                    del self._fav_tracks[pos]
+                return False
+            self.favorites.add(path)
+            if path in self._pos:
+                self._fav_tracks.insert(pos, path)
+            return True
+
+    def favorite_tracks(self):
+        return self._fav_tracks
+
+    def retokenize(self, paths):
+        with self._lock:
+            for path in paths:
+                self._drop_tokens(path)
+            self._index_tokens([p for p in paths if p in self._pos])
+
+    def search(self, query):
+        """Paths whose tokens start with every word of query, or None for an empty query."""
+        words = self.tokenize(query)
+        if not words:
+            return None
+        with self._lock:
+            if self._tokens_dirty:
+                self._token_list = sorted(self._tokens)
+                self._tokens_dirty = False
+            result = None
+            for word in words:
+                matches = set()
+                i = bisect.bisect_left(self._token_list, word)
+                while i < len(self._token_list) and self._token_list[i].startswith(word):
+                    matches |= self._tokens.get(self._token_list[i], set())
+                    i += 1
+                result = matches if result is None else result & matches
+                if not result:
+                    break
+            return result
+
+    def _reindex(self):
+        self._pos = {path: i for i, path in enumerate(self.tracks)}
+        self._fav_tracks = [p for p in self.tracks if p in self.favorites]
+
+    def _index_tokens(self, paths):
+        for path in paths:
+            tokens = self.tokenize(self._describe(path))
+            self._path_tokens[path] = tokens
+            for token in tokens:
+                self._tokens.setdefault(token, set()).add(path)
+        self._tokens_dirty = True
+
+    def _drop_tokens(self, path):
+        for token in self._path_tokens.pop(path, ()):
+            paths = self._tokens.get(token)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self._tokens[token]
+        self._tokens_dirty = True
+
+
+class PlaybackEngine:
+    """Gapless playback on pygame.mixer.music with events for the UI.
+
+    While a track plays the one after it is already queued with music.queue(),
+    so the mixer moves on without a stop/load/play gap. pump() runs from one
+    timer on the Tk loop: it drains pygame's event queue for the mixer's end
+    event (or polls the mixer when events are unavailable), follows queued
+    transitions, and publishes to subscribers:
+
+        track_changed(path), ended(), paused(is_paused), position(pos_ms)
+
+    position is only computed when someone subscribed, at most every
+    PLAYER_POSITION_MS. get_pos() counts time since play() whatever was seeked
+    to since, so the position is kept as the last seek target plus the time
+    played after it.
+    """
+
+    def __init__(self, next_path):
+        self.next_path = next_path  # path -> path to play after it, or None
+        self.current = None
+        self.queued = None
+        self.paused = False
+        self._last_pos = 0
+        self._offset_ms = 0  # track position at the last seek/start
+        self._base_pos = 0   # get_pos() at that moment
+        self._end_event = None
+        self._position_at = 0.0
+        self._subscribers = {}
+
+    def subscribe(self, event, callback):
+        self._subscribers.setdefault(event, []).append(callback)
+
+    def unsubscribe(self, event, callback):
+        callbacks = self._subscribers.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def _publish(self, event, *args):
+        for callback in list(self._subscribers.get(event, ())):
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f'Player {event} handler error: {e}')
+
+    def enable_end_event(self):
+        """Let the mixer post MUSIC_END_EVENT at the end of each track.
+
+        pygame only posts events with SDL's video subsystem up; if it can't be
+        initialized pump() keeps polling get_pos()/get_busy() instead. Call it on
+        the Tk thread, which also owns pump() and so the SDL event queue.
+        """
+        try:
+            if not pygame.display.get_init():
+                pygame.display.init()
+            pygame.mixer.music.set_endevent(MUSIC_END_EVENT)
+            self._end_event = MUSIC_END_EVENT
+        except Exception as e:
+            print(f'Mixer end events unavailable, polling instead: {e}')
+            self._end_event = None
+        return self._end_event is not None
+
+    def play(self, path, start=0.0):
+        pygame.mixer.music.load(path)  # also drops whatever was queued
+        pygame.mixer.music.play(loops=0, start=start)
+        if self._end_event is not None:
+            pygame.event.clear(self._end_event)  # ends of the replaced track, not of this one
+        changed = path != self.current
+        self.current = path
+        self.queued = None
+        self.paused = False
+        self._last_pos = 0
+        self._offset_ms = int(start * 1000)
+        self._base_pos = 0
+        self.requeue()
+        if changed:
+            self._publish('track_changed', path)
+        self._publish('paused', False)
+
+    def requeue(self):
+        """Queue the track after the current one again, e.g. after the playlist changed."""
+        if self.current is None:
+            return
+        path = self.next_path(self.current)
+        if path == self.queued:
+            return
+        self.queued = None
+        if path is None:
+            return
+        try:
+            pygame.mixer.music.queue(path)
+            self.queued = path
+        except Exception as e:
+            print(f'Failed to queue {path}: {e}')
+
+    def pause(self):
+        pygame.mixer.music.pause()
+        self.paused = True
+        self._publish('paused', True)
+
+    def unpause(self):
+        pygame.mixer.music.unpause()
+        self.paused = False
+        self._publish('paused', False)
+
+    def stop(self):
+        pygame.mixer.music.stop()
+        if self._end_event is not None:
+            pygame.event.clear(self._end_event)  # stop() posts one too; it isn't a track end
+        self.current = None
+        self.queued = None
+        self._publish('paused', True)
+
+    def seek(self, seconds):
+        """Jump within the current track: set_pos where the codec supports it,
+        otherwise restart the already loaded track at that point."""
+        if self.current is None:
+            return
+        try:
+            pygame.mixer.music.set_pos(seconds)
+            self._base_pos = max(0, pygame.mixer.music.get_pos())
+        except pygame.error:
+            pygame.mixer.music.play(loops=0, start=seconds)
+            if self.paused:
+                pygame.mixer.music.pause()
+            self._base_pos = 0
+            self._last_pos = 0
+            self.queued = None
+            self.requeue()
+        self._offset_ms = int(seconds * 1000)
+        if self._subscribers.get('position'):
+            self._publish('position', self.position())
+
+    def position(self):
+        pos = pygame.mixer.music.get_pos()
+        if pos < 0:
+            return self._offset_ms
+        return max(0, self._offset_ms + pos - self._base_pos)
+
+    def pump(self):
+        if self._end_event is not None:
+            for event in pygame.event.get():
+                if event.type == self._end_event:
+                    self._track_finished()
+        elif self.current is not None and not self.paused:
+            pos = pygame.mixer.music.get_pos()
+            if self.queued is not None and 0 <= pos < self._last_pos:
+                self._track_finished()
+            elif not pygame.mixer.music.get_busy():
+                self._track_finished()
+            self._last_pos = max(0, pos)
+        if self._subscribers.get('position') and self.current is not None and not self.paused:
+            now = time.monotonic()
+            if now - self._position_at >= PLAYER_POSITION_MS / 1000:
+                self._position_at = now
+                self._publish('position', self.position())
+
+    def _track_finished(self):
+        if self.current is None:
+            return
+        if self.queued is not None:
+            # The mixer has already started the queued track
+            self.current = self.queued
+            self.queued = None
+            self._offset_ms = 0
+            self._base_pos = 0
+            self._publish('track_changed', self.current)
+            self.requeue()
+        else:
+            self.current = None
+            self._publish('ended')
+
 
 class HytaleApp:
     def __init__(self, root):
@@ -73,25 +1679,40 @@ class HytaleApp:
         self.root.configure(bg=HYTALE_STYLE['bg'])
 
         self.colors = HYTALE_STYLE
-        self.headers = {
+        self.ui = UiDispatcher(root)
+        self.http = HttpClient(headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
-        self.news_cache = self.load_cache()
+        })
+        self.headers = self.http.headers
+        self.image_cache = ImageCache(IMAGE_CACHE_DIR)
+        self._decode_pool = None
+        self._decode_lock = threading.Lock()
+
+        self.article_store = ArticleStore(ARTICLE_DB_FILE, legacy_json=CACHE_FILE)
+        self.translation_memory = TranslationMemory(self.article_store)
+        self.translate_executor = TranslationExecutor()
+        self.prefetcher = ArticlePrefetcher(self._prefetch_article)
         self.translator = None
-        self.image_refs = []                            
+        self.photo_cache = PhotoCache()
+        self.feed = {'news': None, 'channels': {}}  # what the feed sections show, as saved in the snapshot
+        self._feed_dirty = False
+        self.refresh_scheduler = RefreshScheduler(['news'] + [ch['name'] for ch in CHANNELS_DATA])
+        self._refreshing = False
+        self._last_input = time.monotonic()
         # Music player related
         self.music_folder = os.path.join(os.getcwd(), 'Music')
-        self.music_files = []
+        self.track_index = TrackIndex(TRACK_INDEX_FILE)
+        self.playlist = Playlist(describe=self._track_search_text)
         self.music_index = 0
         # Using pygame for audio playback
         self.pygame_available = False
         self.is_muted = False
         self._is_paused = False
         self.favorites_file = 'music_favorites.json'
-        self.favorites = set()
         self._last_playing_state = False
         self._volume = 0.21  # Default volume set to 21%
+        self._seek_job = None
+        self._library_listeners = []
 
                                                               
         try:
@@ -130,6 +1751,15 @@ class HytaleApp:
                  
         self.create_section('📰 Новости Hytale.com ', 'news_container')
         self.create_section('📺 Свежие видео', 'yt_container')
+        self.news_section = FeedSection(self.news_container, lambda item: self.add_item(
+            self.news_container, item[0], item[1], self.colors['link'], is_youtube=False))
+        # One slot per channel keeps the original order while results arrive out of order
+        self.channel_sections = {}
+        for ch in CHANNELS_DATA:
+            slot = tk.Frame(self.yt_container, bg=self.colors['card_bg'])
+            slot.pack(fill='x')
+            self.channel_sections[ch['name']] = FeedSection(slot, lambda item, slot=slot: self.add_item(
+                slot, item[0], item[1], self.colors['text'], is_youtube=True, youtube_id=item[2]))
 
         self.refresh_btn = tk.Button(root, text='🔄 ОБНОВИТЬ', command=self.start_update,
                                      bg=self.colors['accent'], fg='#111', font=('Segoe UI', 10, 'bold'), relief='flat', padx=14, pady=7)
@@ -148,146 +1778,222 @@ class HytaleApp:
         attribution.pack(side='right', padx=12)
         attribution.bind('<Button-1>', lambda e: self._open_link('https://bio.link/kdg_info'))
 
+        self.root.protocol('WM_DELETE_WINDOW', self._on_close)
         self.update_timer()
+        self._load_feed_snapshot()
         self.start_update()
+        for sequence in ('<Any-KeyPress>', '<Any-ButtonPress>', '<Motion>', '<MouseWheel>'):
+            self.root.bind_all(sequence, self._note_input, add='+')
+        self.root.after(REFRESH_TICK_MS, self._refresh_tick)
 
         # Initialize music player asynchronously so it doesn't block UI
         threading.Thread(target=self._init_music_player, daemon=True).start()
 
-    def load_cache(self):
-        if os.path.exists(CACHE_FILE):
-            try:
-                with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-
-    def save_cache(self):
+    def _on_close(self):
         try:
-            with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.news_cache, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Ошибка сохранения кэша: {e}")
+            self.ui.close()
+            self.translate_executor.shutdown()
+            if self._decode_pool is not None:
+                self._decode_pool.shutdown(wait=False, cancel_futures=True)
+            self.article_store.close()
+            self.http.close()
+        finally:
+            self.root.destroy()
+
+    def _post_status(self, text):
+        """Status bar text from any thread; only the latest pending text gets painted."""
+        self.ui.post(lambda: self.status_bar.config(text=text), key='status')
 
     def clear_cache(self):
-        self.news_cache = {}
-        if os.path.exists(CACHE_FILE):
-            try:
-                os.remove(CACHE_FILE)
-            except Exception as e:
-                messagebox.showerror('Ошибка', f'Не удалось удалить кэш: {e}')
-                return
+        try:
+            self.article_store.clear()
+            self.translation_memory.clear()
+            self.image_cache.clear()
+        except Exception as e:
+            messagebox.showerror('Ошибка', f'Не удалось удалить кэш: {e}')
+            return
         self.status_bar.config(text='Кэш очищен')
 
                                                           
-    def fetch_news_content_structured(self, url):
-        cached = self.news_cache.get(url)
-        if isinstance(cached, dict) and cached.get('blocks'):
+    def fetch_news_content_structured(self, url, quiet=False):
+        cached = self.article_store.get(url)
+        if cached and cached.get('blocks'):
             return cached['blocks']
-        if isinstance(cached, list):
-            return cached
         try:
-            self.root.after(0, lambda: self.status_bar.config(text=f"Загрузка статьи..."))
-            r = requests.get(url, headers=self.headers, timeout=12)
+            if not quiet:
+                self._post_status("Загрузка статьи...")
+            r = self.http.get(url, timeout=12)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, 'html.parser')
-            article = soup.find('div', class_=re.compile('post-body|content|article-body')) or soup.find('article') or soup.find('main')
-            structured = []
-            if article:
-                for e in article.find_all(['script','style','nav','header','footer','aside']): e.decompose()
-                for element in article.find_all(['p','h1','h2','h3','img','figure','iframe','div','ul','ol']):
-                    if element.name == 'iframe' and 'youtube' in element.get('src',''):
-                        src = element.get('src')
-                        m = re.search(r'(?:v=|/)([0-9A-Za-z_-]{11})', src)
-                        if m:
-                            vid = m.group(1)
-                            structured.append({'type':'video','src':f'https://www.youtube.com/embed/{vid}'})
-                        else:
-                            structured.append({'type':'video','src':src})
-                    elif element.name == 'img':
-                        src = element.get('src')
-                        if src: structured.append({'type':'img','src':src})
-                    elif element.name == 'figure':
-                        img = element.find('img')
-                        if img and img.get('src'):
-                            structured.append({'type':'img','src':img.get('src')})
-                            figcap = element.find('figcaption')
-                            if figcap and figcap.get_text(strip=True):
-                                structured.append({'type':'text','content':f"[Подпись: {figcap.get_text(strip=True)}]", 'style':'caption'})
-                    elif element.name in ['p','h1','h2','h3','ul','ol']:
-                        text = element.get_text(strip=True)
-                        if text and len(text) > 6:
-                            style = 'header' if element.name.startswith('h') else 'normal'
-                            structured.append({'type':'text','content':text,'style':style})
-            else:
-                structured = [{'type':'text','content':'Не удалось извлечь содержимое статьи.','style':'error'}]
-            self.news_cache[url] = {'blocks': structured}
-            self.save_cache()
+            structured = extract_article_blocks(r.text)
+            if not is_error_blocks(structured):
+                self.article_store.put(url, blocks=structured)
             return structured
         except Exception as e:
             print('Ошибка загрузки новости:', e)
             return [{'type':'text','content':f'Ошибка загрузки: {e}','style':'error'}]
 
                      
-    def translate_text(self, text):
-        if not text or not text.strip(): return text
+    def _translate_text_online(self, text):
+        """Translation of text, or None when every backend failed."""
         if self.translator:
             try:
-                if getattr(self.translator.detect(text),'lang','') == 'ru': return text
-            except: pass
-            try:
-                res = self.translator.translate(text, dest='ru')
+                res = self.translate_executor.call('googletrans', self.translator.translate, text, dest=TRANSLATE_TARGET)
                 if getattr(res, 'text', None): return res.text
             except: pass
         try:
-            return self._translate_via_googleapi(text)
+            return self.translate_executor.call('googleapis', self._googleapi_request, text) or None
         except:
-            return text
+            return None
 
-    def _translate_blocks(self, blocks):
+    def _prefetch_article(self, url, checkpoint):
+        """Fetch, extract and translate one listed post into the store ahead of a click."""
+        cached = self.article_store.get(url)
+        if cached and cached.get('translated'):
+            return
+        blocks = self.fetch_news_content_structured(url, quiet=True)
+        if is_error_blocks(blocks):
+            return
+        checkpoint()
+        translated, failed = self._translate_blocks(blocks, report=False, checkpoint=checkpoint)
+        if not failed:  # otherwise opening the article tries the missing blocks again
+            self.article_store.put(url, blocks=blocks, translated=translated)
+
+    def _translate_blocks(self, blocks, on_block=None, report=True, checkpoint=None):
+        """Translate all text blocks in as few requests as possible, per block only as a fallback.
+
+        Each distinct string is looked up in the translation memory first and sent
+        at most once, however often it repeats in the article. Text that is already
+        Russian or has nothing to translate never leaves the machine. Batches run in
+        parallel on the translation executor. on_block(index, block) is called for
+        every text block as soon as its translation is known; report=False keeps
+        progress off the status bar. With checkpoint (background work) the batches
+        run one at a time in the calling thread instead of on the pool, calling
+        checkpoint() before each so foreground translations go first.
+
+        Returns (translated blocks, failed): blocks whose translation failed keep
+        their source text and stay out of the memory, and failed is True so the
+        caller doesn't store the result as final.
+        """
+        known = {}
+        for b in blocks:
+            if b['type'] == 'text' and b['content'].strip() and b['content'] not in known:
+                if classify_language(b['content']) != 'translate':
+                    known[b['content']] = b['content']
+                else:
+                    known[b['content']] = self.translation_memory.get(b['content'])
+        positions = {}
+        for i, b in enumerate(blocks):
+            if b['type'] == 'text' and b['content'] in known:
+                positions.setdefault(b['content'], []).append(i)
+
+        def emit(text):
+            if on_block:
+                for i in positions[text]:
+                    on_block(i, {'type':'text','content':known[text],'style':blocks[i].get('style','normal')})
+
+        for text, result in known.items():
+            if result is not None and result != text:
+                emit(text)
+        texts = [text for text, result in known.items() if result is None]
+        batches = [[texts[j] for j in batch] for batch in pack_translation_batches(texts)]
+
+        def translate_batch(batch):
+            out = self._translate_batch_via_googleapi(batch) if len(batch) > 1 else None
+            return out if out is not None else [self._translate_text_online(t) for t in batch]
+
+        finished = [0]
+        failed = [False]
+        def on_batch(i, out):
+            if isinstance(out, Exception):
+                out = [None] * len(batches[i])
+            for text, result in zip(batches[i], out):
+                if result is None:
+                    known[text] = text
+                    failed[0] = True
+                    continue
+                known[text] = result
+                self.translation_memory.put(text, result)
+                emit(text)
+            finished[0] += 1
+            if report:
+                status = f'Перевод: {finished[0]}/{len(batches)} частей · {self.translate_executor.describe()}'
+                self._post_status(status)
+
+        if checkpoint is None:
+            self.translate_executor.map(translate_batch, batches, on_result=on_batch)
+        else:
+            for i, batch in enumerate(batches):
+                checkpoint()
+                try:
+                    out = translate_batch(batch)
+                except Exception as e:
+                    out = e
+                on_batch(i, out)
         translated = []
         for b in blocks:
-            if b['type'] == 'text':
-                translated.append({'type':'text','content':self.translate_text(b['content']),'style':b.get('style','normal')})
+            if b['type'] == 'text' and b['content'] in known:
+                translated.append({'type':'text','content':known[b['content']],'style':b.get('style','normal')})
             else:
                 translated.append(b)
-        return translated
-
-    def _translate_via_googleapi(self, text):
-        if not text: return text
+        return translated, failed[0]
+
+    def _googleapi_request(self, text, timeout=10):
+        """One translate.googleapis.com call; raises on HTTP errors so the executor can retry."""
+        q = quote_plus(text)
+        url = f"https://translate.googleapis.com/translate_a/single?client=gtx&sl=auto&tl={TRANSLATE_TARGET}&dt=t&q={q}"
+        r = self.http.get(url, timeout=timeout, conditional=False)
+        r.raise_for_status()
+        data = r.json()
+        return ''.join([s[0] for s in data[0] if s and s[0]])
+
+    def _translate_batch_via_googleapi(self, texts):
+        """Translate several texts in one request, one per line; None if the lines don't map back 1:1."""
         try:
-            q = quote_plus(text)
-            url = f"https://translate.googleapis.com/translate_a/single?client=gtx&sl=auto&tl=ru&dt=t&q={q}"
-            r = requests.get(url, headers={'User-Agent': self.headers['User-Agent']}, timeout=10)
-            data = r.json()
-            if isinstance(data, list) and len(data) > 0:
-                return ''.join([s[0] for s in data[0] if s and s[0]])
+            joined = self.translate_executor.call('googleapis', self._googleapi_request,
+                                                  '\n'.join(t.replace('\n', ' ') for t in texts), timeout=15)
+            parts = joined.strip('\n').split('\n')
+            if len(parts) == len(texts) and all(p.strip() for p in parts):
+                return [p.strip() for p in parts]
         except: pass
-        return text
+        return None
 
                                          
     def open_news_window(self, url, title):
         def load():
+            # A prefetch of this article stops at its next step; the batches it already
+            # translated are in the translation memory, the rest go to the executor
+            self.prefetcher.hold()
+            self.prefetcher.claim(url)
+            try:
+                show_article()
+            finally:
+                self.prefetcher.release()
+
+        def show_article():
             data = self.fetch_news_content_structured(url)
-            self.root.after(0, lambda: self.status_bar.config(text='Перевод...'))
-            cached = self.news_cache.get(url)
-            translated = None
-            if isinstance(cached, dict):
-                translated = cached.get('translated')
-            if not translated:
-                translated = self._translate_blocks(data)
-                if isinstance(cached, dict):
-                    cached['translated'] = translated
-                    cached['blocks'] = data
-                else:
-                    self.news_cache[url] = {'blocks': data, 'translated': translated}
-                self.save_cache()
-            self.root.after(0, lambda: self._create_news_window(title, translated, url))
-            self.root.after(0, lambda: self.status_bar.config(text='Готово'))
+            cached = self.article_store.get(url)
+            translated = cached.get('translated') if cached else None
+            if translated:
+                self.ui.post(lambda: self._create_news_window(title, translated, url))
+            else:
+                # Show the originals right away and swap each block as its translation lands.
+                # Posts run in order, so the window exists before the first update.
+                view = {}
+                def show():
+                    view['update'] = self._create_news_window(title, data, url)
+                self.ui.post(show)
+                self._post_status('Перевод...')
+                def on_block(i, block):
+                    self.ui.post(lambda: view['update'](i, block))
+                translated, failed = self._translate_blocks(data, on_block=on_block)
+                if not is_error_blocks(data) and not failed:
+                    self.article_store.put(url, blocks=data, translated=translated)
+            hits, misses = self.translation_memory.stats()
+            self._post_status(f'Готово · память переводов: {hits} попаданий, {misses} промахов')
         threading.Thread(target=load, daemon=True).start()
 
     def _create_news_window(self, title, content_blocks, original_url):
+        """Open the article window; returns update(index, block) to replace a text block in place."""
         w = tk.Toplevel(self.root)
         w.title(title)
         w.geometry('1000x820')
@@ -301,12 +2007,25 @@ class HytaleApp:
                      
         main = tk.Frame(w, bg=self.colors['bg'])
         main.pack(fill='both', expand=True, padx=8, pady=4)
+        if ARTICLE_RENDERER == 'text':
+            return self._render_article_text(main, content_blocks, w)
+        return self._render_article_frames(main, content_blocks, w)
+
+    def _render_article_frames(self, main, content_blocks, w):
         canvas = tk.Canvas(main, bg=self.colors['card_bg'], highlightthickness=0)
         sb = tk.Scrollbar(main, orient='vertical', command=canvas.yview)
         frame = tk.Frame(canvas, bg=self.colors['card_bg'])
         frame.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
         canvas.create_window((0,0), window=frame, anchor='nw')
-        canvas.configure(yscrollcommand=sb.set)
+        image_frames = {}
+        def distance(key):
+            top = canvas.canvasy(0)
+            bottom = top + canvas.winfo_height()
+            f = image_frames[key]
+            y0, y1 = f.winfo_y(), f.winfo_y() + f.winfo_height()
+            return 0 if y1 >= top and y0 <= bottom else min(abs(y0 - bottom), abs(top - y1))
+        loader = self._article_image_loader(w, distance)
+        canvas.configure(yscrollcommand=lambda *a: (sb.set(*a), loader.schedule_reprioritize()))
         canvas.pack(side='left', fill='both', expand=True)
         sb.pack(side='right', fill='y')
 
@@ -329,7 +2048,117 @@ class HytaleApp:
         w.bind('<Button-4>', _on_mousewheel)
         w.bind('<Button-5>', _on_mousewheel)
 
-        self._render_content_blocks(frame, content_blocks, w)
+        labels = self._render_content_blocks(frame, content_blocks, loader, image_frames)
+        w.after_idle(loader.reprioritize)
+
+        def update(index, block):
+            label = labels.get(index)
+            try:
+                if label is not None and label.winfo_exists():
+                    label.config(text=block['content'])
+            except tk.TclError:
+                pass
+        return update
+
+    def _render_article_text(self, main, content_blocks, w):
+        """Render the whole article into a single tk.Text; styles are tags, images are embedded.
+
+        Every block is tagged 'block<i>' so update(index, block) can swap it in place.
+        """
+        text = tk.Text(main, bg=self.colors['card_bg'], fg=self.colors['text'], wrap='word', relief='flat',
+                       highlightthickness=0, bd=0, padx=16, pady=8, cursor='arrow', font=('Arial', 11))
+        sb = tk.Scrollbar(main, orient='vertical', command=text.yview)
+        def ypixels(index):
+            n = text.count('1.0', index, 'ypixels')
+            return (n[0] if isinstance(n, tuple) else n) or 0
+        def distance(key):
+            # In pixels, like the canvas renderer: an embedded image is one line but hundreds of pixels
+            ranges = text.tag_ranges(f'block{key}')
+            if not ranges:
+                return 0
+            first, last = text.yview()
+            total = ypixels('end')
+            top, bottom = first * total, last * total
+            y0, y1 = ypixels(ranges[0]), ypixels(ranges[1])
+            return 0 if y1 >= top and y0 <= bottom else min(abs(y0 - bottom), abs(top - y1))
+        loader = self._article_image_loader(w, distance)
+        text.configure(yscrollcommand=lambda *a: (sb.set(*a), loader.schedule_reprioritize()))
+        text.pack(side='left', fill='both', expand=True)
+        sb.pack(side='right', fill='y')
+
+        text.tag_configure('normal', font=('Arial', 11), spacing1=6, spacing3=6)
+        text.tag_configure('header', font=('Arial', 13, 'bold'), foreground=self.colors['accent'], spacing1=10, spacing3=6)
+        text.tag_configure('caption', font=('Arial', 9, 'italic'), spacing1=2, spacing3=6)
+        text.tag_configure('error', font=('Arial', 11), foreground='#ff6b6b', spacing1=6, spacing3=6)
+        text.tag_configure('image', justify='center', foreground=self.colors['date'], spacing1=8, spacing3=8)
+        text.tag_configure('video', font=('Arial', 10, 'bold'), foreground=self.colors['accent'], background=self.colors['video_bg'],
+                           spacing1=8, lmargin1=8, lmargin2=8)
+        text.tag_configure('video_url', font=('Arial', 8), foreground=self.colors['link'], background=self.colors['video_bg'],
+                           justify='center', spacing3=8)
+
+        def _on_mousewheel(event):
+            if hasattr(event, 'delta') and event.delta:
+                text.yview_scroll(-int(event.delta / 120), 'units')
+            elif getattr(event, 'num', None) == 4:
+                text.yview_scroll(-1, 'units')
+            elif getattr(event, 'num', None) == 5:
+                text.yview_scroll(1, 'units')
+            return 'break'
+
+        for widget in (text, w):
+            widget.bind('<MouseWheel>', _on_mousewheel)
+            widget.bind('<Button-4>', _on_mousewheel)
+            widget.bind('<Button-5>', _on_mousewheel)
+
+        def replace(tag, insert):
+            ranges = text.tag_ranges(tag)
+            if not ranges:
+                return
+            # Cached photos arrive while the blocks are still being inserted; leave the
+            # widget writable for them, a disabled Text silently drops every insert
+            state = text.cget('state')
+            text.configure(state='normal')
+            text.delete(ranges[0], ranges[1])
+            text.mark_set('insert', ranges[0])
+            insert()
+            text.configure(state=state)
+
+        for i, block in enumerate(content_blocks):
+            tag = f'block{i}'
+            if block['type'] == 'text':
+                text.insert('end', block['content'] + '\n', (block.get('style','normal'), tag))
+            elif block['type'] == 'img':
+                text.insert('end', '🖼️ Загрузка...\n', ('image', tag))
+                def on_ready(photo, tag=tag):
+                    def insert():
+                        start = text.index('insert')
+                        text.image_create('insert', image=photo)
+                        text.insert('insert', '\n')
+                        text.tag_add('image', start, 'insert')
+                        text.tag_add(tag, start, 'insert')
+                    replace(tag, insert)
+                def on_error(e, tag=tag):
+                    replace(tag, lambda: text.insert('insert', f'Ошибка: {e}\n', ('error', tag)))
+                self._article_photo(block['src'], w, loader, i, on_ready, on_error)
+            elif block['type'] == 'video':
+                src = block['src']
+                link = f'video{i}'
+                display_url = src if len(src) <= 60 else src[:30] + '...' + src[-25:]
+                text.insert('end', '🎥 ВИДЕО (нажмите для просмотра)\n', ('video', link, tag))
+                text.insert('end', display_url + '\n', ('video_url', link, tag))
+                text.tag_bind(link, '<Button-1>', lambda e, src=src: webbrowser.open(src))
+                text.tag_bind(link, '<Enter>', lambda e: text.configure(cursor='hand2'))
+                text.tag_bind(link, '<Leave>', lambda e: text.configure(cursor='arrow'))
+        text.configure(state='disabled')
+        w.after_idle(loader.reprioritize)
+
+        def update(index, block):
+            tag = f'block{index}'
+            try:
+                replace(tag, lambda: text.insert('insert', block['content'] + '\n', (block.get('style','normal'), tag)))
+            except tk.TclError:
+                pass
+        return update
 
     def _open_link(self, url):
         try:
@@ -338,53 +2167,95 @@ class HytaleApp:
         except Exception as exc:
             messagebox.showerror('Ошибка', f'Не удалось открыть ссылку: {exc}')
 
-    def _render_content_blocks(self, parent, blocks, window):
-        for block in blocks:
+    def _render_content_blocks(self, parent, blocks, loader, image_frames):
+        """Render blocks into parent; returns {block index: text label} for in-place updates.
+
+        Image frames are recorded in image_frames by block index for the loader's viewport distance.
+        """
+        labels = {}
+        for i, block in enumerate(blocks):
             if block['type'] == 'text':
-                self._render_text_block(parent, block)
+                labels[i] = self._render_text_block(parent, block)
             elif block['type'] == 'img':
-                self._render_image_block(parent, block, window)
+                image_frames[i] = self._render_image_block(parent, block, loader, i)
             elif block['type'] == 'video':
                 self._render_video_block(parent, block)
+        return labels
 
     def _render_text_block(self, parent, block):
         f = tk.Frame(parent, bg=self.colors['card_bg'])
         f.pack(fill='x', padx=12, pady=6)
         fonts = {'header':('Arial', 13, 'bold'), 'caption':('Arial', 9, 'italic'), 'error':('Arial', 11), 'normal':('Arial', 11)}
         colors = {'header':self.colors['accent'], 'caption':self.colors['text'], 'error':'#ff6b6b', 'normal':self.colors['text']}
-        tk.Label(f, text=block['content'], font=fonts.get(block.get('style','normal')), fg=colors.get(block.get('style','normal')), bg=self.colors['card_bg'], wraplength=880, justify='left').pack()
+        lbl = tk.Label(f, text=block['content'], font=fonts.get(block.get('style','normal')), fg=colors.get(block.get('style','normal')), bg=self.colors['card_bg'], wraplength=880, justify='left')
+        lbl.pack()
+        return lbl
 
-    def _render_image_block(self, parent, block, window):
+    def _render_image_block(self, parent, block, loader, key):
         f = tk.Frame(parent, bg=self.colors['card_bg'])
         f.pack(fill='x', padx=12, pady=8)
         ph = tk.Label(f, text='🖼️ Загрузка...', bg=self.colors['card_bg'], fg=self.colors['date'])
         ph.pack()
-        threading.Thread(target=self._download_and_display_image, args=(block['src'], f, ph, window), daemon=True).start()
+        def on_ready(photo):
+            ph.destroy()
+            lbl = tk.Label(f, image=photo, bg=self.colors['card_bg'])
+            lbl.image = photo
+            lbl.pack(pady=6)
+        def on_error(e):
+            ph.config(text=f'Ошибка: {e}', fg='#ff6b6b')
+        self._article_photo(block['src'], parent.winfo_toplevel(), loader, key, on_ready, on_error)
+        return f
+
+    def _article_image_loader(self, window, distance):
+        return LazyImageLoader(window, lambda url: self._load_image(url, ARTICLE_VARIANT), distance, self.ui.post)
+
+    def _article_photo(self, src, window, loader, key, on_ready, on_error):
+        """Hand on_ready a PhotoImage for src: at once from the photo cache, otherwise via the loader."""
+        url = 'https://hytale.com' + src if src.startswith('/') else src
+        photo = self.photo_cache.get((url, ARTICLE_VARIANT), owner=window)
+        if photo is not None:
+            on_ready(photo)
+            return
+        loader.add(key, url, lambda img: on_ready(self.photo_cache.put((url, ARTICLE_VARIANT), img, owner=window)), on_error)
+
+    def _load_image(self, url, variant, timeout=10):
+        """Return the resized image for url, touching the network only on a full cache miss."""
+        img = self.image_cache.get_variant(url, variant)
+        if img is not None:
+            return img
+        data = self.image_cache.get_original(url)
+        if data is None:
+            r = self.http.get(url, timeout=timeout, conditional=False)
+            r.raise_for_status()
+            data = r.content
+            self.image_cache.put_original(url, data)
+        img = self._decode_image(data, variant)
+        self.image_cache.put_variant(url, variant, img)
+        return img
 
-    def _download_and_display_image(self, url, frame, placeholder, window):
+    def _decode_image(self, data, variant):
+        """Run decode_image in the process pool so decoding doesn't hold the GIL; in-thread if the pool is unusable.
+
+        Errors from decoding itself (corrupt or truncated data) reach the caller.
+        """
         try:
-            if url.startswith('/'):
-                url = 'https://hytale.com' + url
-            r = requests.get(url, timeout=10)
-            r.raise_for_status()
-            img = Image.open(BytesIO(r.content)).convert('RGBA')
-            target_w = 880
-            if img.width > target_w:
-                wpercent = (target_w / float(img.width))
-                hsize = int((float(img.height) * float(wpercent)))
-                img = img.resize((target_w, hsize), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            def upd():
-                placeholder.destroy()
-                lbl = tk.Label(frame, image=photo, bg=self.colors['card_bg'])
-                lbl.image = photo
-                self.image_refs.append(photo)
-                lbl.pack(pady=6)
-            window.after(0, upd)
-        except Exception as e:
-            def err():
-                placeholder.config(text=f'Ошибка: {e}', fg='#ff6b6b')
-            window.after(0, err)
+            with self._decode_lock:
+                if self._decode_pool is None:
+                    self._decode_pool = ProcessPoolExecutor(max_workers=IMAGE_DECODE_PROCESSES)
+                pool = self._decode_pool
+            future = pool.submit(decode_image, data, variant)
+        except (OSError, RuntimeError) as e:
+            print('Image decode pool unavailable:', e)
+            return Image.frombytes(*decode_image(data, variant))
+        try:
+            mode, size, pixels = future.result()
+        except BrokenProcessPool as e:
+            print('Image decode pool broken, restarting it:', e)
+            with self._decode_lock:
+                if self._decode_pool is pool:
+                    self._decode_pool = None
+            mode, size, pixels = decode_image(data, variant)
+        return Image.frombytes(mode, size, pixels)
 
     def _render_video_block(self, parent, block):
                                                               
@@ -480,7 +2351,7 @@ class HytaleApp:
 
     def get_real_channel_id(self, url):
         try:
-            r = requests.get(url, headers=self.headers, timeout=5)
+            r = self.http.get(url, timeout=5)
             match = re.search(r'"channelId":"(UC[\w-]{22})"', r.text)
             if match: return match.group(1)
             match_alt = re.search(r'https://www.youtube.com/channel/(UC[\w-]{22})', r.text)
@@ -488,65 +2359,197 @@ class HytaleApp:
         except: pass
         return None
 
-    def start_update(self):
+    def start_update(self, sources=None):
+        """Refresh the given sources ('news' and channel names), all of them by default.
+
+        Does nothing while another refresh is running.
+        """
+        if self._refreshing:
+            return
+        self._refreshing = True
         self.refresh_btn.config(state='disabled', text='Загрузка...')
         self.status_bar.config(text='Обновление данных...')
-        threading.Thread(target=self.fetch_all_data, daemon=True).start()
+        threading.Thread(target=self.fetch_all_data, args=(sources,), daemon=True).start()
 
-    def fetch_all_data(self):
-        self.clear_frame(self.news_container)
-        self.clear_frame(self.yt_container)
-                             
-        try:
-            r = requests.get(HYTALE_API_URL, headers=self.headers, timeout=10)
-            if r.status_code == 200:
-                posts = r.json()
-                for post in posts[:4]:
-                    title = post.get('title','No Title')
-                    slug = post.get('slug','')
-                    dt = datetime.fromisoformat(post.get('publishedAt','').replace('Z','+00:00'))
-                    url = f"https://hytale.com/news/{dt.year}/{dt.strftime('%m')}/{slug}"
-                    self.add_item(self.news_container, f"{dt.strftime('%d.%m')} | {title}", url, self.colors['link'], is_youtube=False)
-            else:
-                self.add_error(self.news_container, f"Сайт недоступен (Код {r.status_code})")
-        except Exception as e:
-            self.add_error(self.news_container, f"Ошибка доступа к API Hytale: {e}")
+    def _note_input(self, event=None):
+        self._last_input = time.monotonic()
 
-                                  
+    def _refresh_tick(self):
+        """Refresh the sources whose schedule is due, unless the window is minimized or nobody is using it."""
+        self.root.after(REFRESH_TICK_MS, self._refresh_tick)
+        if self._refreshing or time.monotonic() - self._last_input > REFRESH_IDLE_AFTER:
+            return
+        try:
+            if self.root.state() == 'iconic':
+                return
+        except tk.TclError:
+            return
+        due = self.refresh_scheduler.due()
+        if due:
+            self.start_update(due)
+
+    def fetch_all_data(self, sources=None):
+        """Fetch the blog API and channels at once; a source is re-rendered only if its result changed."""
+        started = time.monotonic()
+        pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS)
+        futures = {}
+        if sources is None or 'news' in sources:
+            futures[pool.submit(self._fetch_news_posts)] = None
         for ch in CHANNELS_DATA:
-            try:
-                current_id = ch.get('id')
-                if current_id:
-                    rss_url = f'https://www.youtube.com/feeds/videos.xml?channel_id={current_id}'
+            if sources is None or ch['name'] in sources:
+                futures[pool.submit(self._fetch_channel_video, ch)] = ch
+        pending = set(futures)
+        try:
+            for fut in as_completed(futures, timeout=REFRESH_DEADLINE):
+                pending.discard(fut)
+                self._show_source(futures[fut], *fut.result())
+        except FuturesTimeout:
+            for fut in pending:
+                ch = futures[fut]
+                if fut.done():
+                    self._show_source(ch, *fut.result())
+                elif ch is None:
+                    self._show_source(ch, None, 'API Hytale: превышено время ожидания')
                 else:
-                    rss_url = None
-                feed = None
-                if rss_url:
-                    xml = requests.get(rss_url, headers=self.headers, timeout=6)
+                    self._show_source(ch, None, f"{ch['name']}: превышено время ожидания")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        elapsed = time.monotonic() - started
+        self.ui.post(self._save_feed_snapshot)
+        self.ui.post(self._refresh_done)
+        self._post_status(f"Обновлено: {datetime.now().strftime('%H:%M:%S')} ({elapsed:.1f} с)")
+
+    def _refresh_done(self):
+        self._refreshing = False
+        self.refresh_btn.config(state='normal', text='🔄 ОБНОВИТЬ')
+
+    def _show_source(self, ch, result, error):
+        """Record the fetch with the scheduler and post rendering to the Tk thread if the source changed."""
+        if ch is None and not error:
+            # Every successful fetch, changed or not: posts whose prefetch failed get retried
+            self.prefetcher.submit([url for _, url in result])
+        if not self.refresh_scheduler.record('news' if ch is None else ch['name'], result, error) and not error:
+            return
+        if ch is None:
+            self.ui.post(lambda: self._show_news(result, error))
+        else:
+            self.ui.post(lambda: self._show_channel(ch['name'], result, error))
+
+    def _fetch_news_posts(self):
+        try:
+            r = self.http.get(HYTALE_API_URL, timeout=10)
+            if r.status_code != 200:
+                return None, f"Сайт недоступен (Код {r.status_code})"
+            items = []
+            for post in r.json()[:4]:
+                title = post.get('title','No Title')
+                slug = post.get('slug','')
+                dt = datetime.fromisoformat(post.get('publishedAt','').replace('Z','+00:00'))
+                url = f"https://hytale.com/news/{dt.year}/{dt.strftime('%m')}/{slug}"
+                items.append((f"{dt.strftime('%d.%m')} | {title}", url))
+            return items, None
+        except Exception as e:
+            return None, f"Ошибка доступа к API Hytale: {e}"
+
+    def _fetch_channel_video(self, ch):
+        try:
+            current_id = ch.get('id')
+            if current_id:
+                rss_url = f'https://www.youtube.com/feeds/videos.xml?channel_id={current_id}'
+            else:
+                rss_url = None
+            feed = None
+            if rss_url:
+                xml = self.http.get(rss_url, timeout=6)
+                feed = feedparser.parse(xml.content)
+            if not feed or not feed.entries:
+                new_id = self.get_real_channel_id(ch['url'])
+                if new_id:
+                    ch['id'] = new_id
+                    xml = self.http.get(f'https://www.youtube.com/feeds/videos.xml?channel_id={new_id}', timeout=6)
                     feed = feedparser.parse(xml.content)
-                if not feed or not feed.entries:
-                    new_id = self.get_real_channel_id(ch['url'])
-                    if new_id:
-                        ch['id'] = new_id
-                        xml = requests.get(f'https://www.youtube.com/feeds/videos.xml?channel_id={new_id}', headers=self.headers, timeout=6)
-                        feed = feedparser.parse(xml.content)
-
-                if feed and feed.entries:
-                    video = feed.entries[0]
-                                       
-                    m = re.search(r'v=([0-9A-Za-z_-]{11})', video.link)
-                    vid = m.group(1) if m else None
-                    self.add_item(self.yt_container, f"[{ch['name']}] {video.title}", video.link, self.colors['text'], is_youtube=True, youtube_id=vid)
-                else:
-                    self.add_error(self.yt_container, f"{ch['name']}: Видео не найдены")
-            except Exception as e:
-                self.add_error(self.yt_container, f"{ch['name']}: Ошибка загрузки: {e}")
 
-        self.root.after(0, lambda: self.refresh_btn.config(state='normal', text='🔄 ОБНОВИТЬ'))
-        self.root.after(0, lambda: self.status_bar.config(text=f"Обновлено: {datetime.now().strftime('%H:%M:%S')}") )
+            if feed and feed.entries:
+                video = feed.entries[0]
+                m = re.search(r'v=([0-9A-Za-z_-]{11})', video.link)
+                vid = m.group(1) if m else None
+                return (f"[{ch['name']}] {video.title}", video.link, vid), None
+            return None, f"{ch['name']}: Видео не найдены"
+        except Exception as e:
+            return None, f"{ch['name']}: Ошибка загрузки: {e}"
+
+    def _show_news(self, items, error):
+        """Reconcile the post list by slug; errors keep what's shown."""
+        if error:
+            self.news_section.show_error(error, self.add_error)
+            return
+        items = [list(item) for item in items]
+        if self.news_section.reconcile([(url.rstrip('/').rsplit('/', 1)[-1], [text, url]) for text, url in items]):
+            self.feed['news'] = items
+            self._feed_dirty = True
+
+    def _show_channel(self, name, video, error):
+        """Reconcile one channel slot by video ID; errors keep what's shown."""
+        section = self.channel_sections[name]
+        if error:
+            section.show_error(error, self.add_error)
+            return
+        video = list(video)
+        if section.reconcile([(video[2] or video[1], video)]):
+            self.feed['channels'][name] = video
+            self._feed_dirty = True
+
+    def _load_feed_snapshot(self):
+        """Paint the last saved feed before any network request; the refresh then swaps what changed."""
+        try:
+            if not os.path.exists(FEED_SNAPSHOT_FILE):
+                return
+            with open(FEED_SNAPSHOT_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            channels = {name: entry for name, entry in data.get('channels', {}).items()
+                        if name in self.channel_sections and entry.get('video')}
+        except Exception as e:
+            print('Failed to load feed snapshot:', e)
+            return
+        # Thumbnails come from the disk cache right away so rows don't start as placeholders
+        for entry in channels.values():
+            key = tuple(entry['thumb']) if entry.get('thumb') else None
+            if key and self.photo_cache.get(key) is None:
+                img = self.image_cache.get_variant(*key)
+                if img is not None:
+                    self.photo_cache.put(key, img)
+        if data.get('news'):
+            self._show_news(data['news'], None)
+            self.prefetcher.submit([url for _, url in data['news']])
+        for name, entry in channels.items():
+            self._show_channel(name, entry['video'], None)
+        self._feed_dirty = False
+
+    def _save_feed_snapshot(self):
+        if not self._feed_dirty:
+            return
+        self._feed_dirty = False
+        channels = {}
+        for name, video in self.feed['channels'].items():
+            vid = video[2]
+            thumb = [youtube_thumb_url(vid, int(THUMB_VARIANT[1:])), THUMB_VARIANT] if vid else None
+            channels[name] = {'video': video, 'thumb': thumb}
+        try:
+            tmp = FEED_SNAPSHOT_FILE + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'news': self.feed['news'], 'channels': channels}, f, ensure_ascii=False)
+            os.replace(tmp, FEED_SNAPSHOT_FILE)
+        except Exception as e:
+            print('Failed to save feed snapshot:', e)
 
     # ------------------------ Music Player -----------------------------
     def _init_music_player(self):
+        """Background part of the player setup: mixer, music folder, library scan.
+
+        Everything that touches Tk or pygame's event queue is posted to the Tk
+        thread (_start_music_player).
+        """
         # Initialize pygame embedded audio backend (pygame + mutagen)
         try:
             # Initialize pygame mixer
@@ -557,10 +2560,6 @@ class HytaleApp:
             self._prev_volume = self._volume  # Initialize previous volume
             pygame.mixer.music.set_volume(self._volume)
             
-            self.pygame_available = True
-            self._is_paused = True  # Start paused until user interacts
-            self.is_muted = False
-            
             print('pygame mixer initialized with 21% volume')
             
             # Create music folder if it doesn't exist
@@ -573,6 +2572,23 @@ class HytaleApp:
             # Scan for music files and load favorites
             self._scan_music_files()
             self._load_favorites()
+            self.track_index.ensure(self.music_files, on_done=lambda: self.playlist.retokenize(list(self.music_files)))
+        except Exception as e:
+            print('pygame/mutagen init failed:', e)
+            self.ui.post(self._music_unavailable)
+            return
+        self.ui.post(self._start_music_player)
+
+    def _start_music_player(self):
+        try:
+            self.player = PlaybackEngine(self._next_track)
+            self.player.subscribe('track_changed', self._on_track_changed)
+            self.player.subscribe('paused', self._on_player_paused)
+            self.player.subscribe('ended', self._play_next)
+            self.player.enable_end_event()
+            self.pygame_available = True
+            self._is_paused = True  # Start paused until user interacts
+            self.is_muted = False
             
             # Autoplay first track if available
             if self.music_files:
@@ -581,29 +2597,53 @@ class HytaleApp:
             
             # Add player controls to the main window
             self._add_main_player_controls()
-            
+            self._pump_player()
         except Exception as e:
             print('pygame/mutagen init failed:', e)
-            self.pygame_available = False
-            self.status_bar.config(text='Аудио недоступно. Установите pygame и mutagen для воспроизведения музыки.')
-            # Disable buttons if they exist
-            if hasattr(self, 'mute_btn'):
-                self.mute_btn.config(state='disabled')
-            if hasattr(self, 'open_player_btn'):
-                self.open_player_btn.config(state='disabled')
-            return
+            self._music_unavailable()
+
+    def _music_unavailable(self):
+        self.pygame_available = False
+        self.status_bar.config(text='Аудио недоступно. Установите pygame и mutagen для воспроизведения музыки.')
+        # Disable buttons if they exist
+        if hasattr(self, 'mute_btn'):
+            self.mute_btn.config(state='disabled')
+        if hasattr(self, 'open_player_btn'):
+            self.open_player_btn.config(state='disabled')
+
+    @property
+    def music_files(self):
+        return self.playlist.tracks
+
+    @property
+    def favorites(self):
+        return self.playlist.favorites
 
     def _scan_music_files(self):
-        exts = ('.mp3', '.ogg', '.wav', '.flac', '.aac', '.m4a')
-        files = []
-        try:
-            for fname in sorted(os.listdir(self.music_folder)):
-                if fname.lower().endswith(exts):
-                    files.append(os.path.join(self.music_folder, fname))
-        except Exception as e:
-            print('Error scanning music folder:', e)
-        self.music_files = files
-        return files
+        self.library = MusicLibraryScanner(self.music_folder, LIBRARY_SNAPSHOT_FILE,
+                                           on_delta=lambda added, removed: self.ui.post(lambda: self._apply_library_delta(added, removed)))
+        self.library.scan()
+        self.playlist.reset(self.library.files())
+        self.library.start()
+        return self.music_files
+
+    def _apply_library_delta(self, added, removed):
+        """Patch the playlist with scanner deltas, keeping the current track selected."""
+        current = self.music_files[self.music_index] if self.music_files else None
+        gone = set(removed)
+        if gone:
+            self.playlist.remove(gone)
+            self.track_index.forget(gone)
+        if added:
+            self.playlist.add(added)
+            self.track_index.ensure(added, on_done=lambda: self.playlist.retokenize(added))
+        if current in gone or current is None:
+            self.music_index = min(self.music_index, max(0, len(self.music_files) - 1))
+        else:
+            self.music_index = self.playlist.index_of(current)
+        self.player.requeue()
+        for listener in list(self._library_listeners):
+            listener()
 
     def _load_favorites(self):
         try:
@@ -611,7 +2651,7 @@ class HytaleApp:
                 with open(self.favorites_file, 'r', encoding='utf-8') as f:
                     favs = json.load(f)
                     if isinstance(favs, list):
-                        self.favorites = set(favs)
+                        self.playlist.set_favorites(favs)
         except Exception as e:
             print('Failed to load favorites:', e)
 
@@ -642,6 +2682,23 @@ class HytaleApp:
                                         bg=self.colors['accent'], fg='#111',
                                         relief='flat', font=('Segoe UI', 9, 'bold'))
         self.open_player_btn.pack(side='right', padx=5)
+
+        # Now playing, kept current by player events
+        now_playing = tk.Label(controls_frame, text='', bg=self.colors['bg'], fg=self.colors['date'],
+                               font=('Segoe UI', 9), anchor='w')
+        now_playing.pack(side='left', fill='x', expand=True, padx=5)
+
+        def _show_now_playing(*_):
+            path = self.player.current if self.pygame_available else None
+            if path is None:
+                now_playing.config(text='')
+            else:
+                now_playing.config(text=('⏸ ' if self._is_paused else '♪ ') + self._track_title(path))
+        if self.pygame_available:
+            self.player.subscribe('track_changed', _show_now_playing)
+            self.player.subscribe('paused', _show_now_playing)
+            self.player.subscribe('ended', _show_now_playing)
+        _show_now_playing()
         
         # Set initial states
         if not self.pygame_available:
@@ -659,7 +2716,7 @@ class HytaleApp:
             # If not muted, stop the music and store the current track
             if pygame.mixer.music.get_busy() and not self._is_paused:
                 self._last_playing_index = self.music_index
-                pygame.mixer.music.stop()
+                self.player.stop()
                 self._is_paused = True
             self.is_muted = True
             self.mute_btn.config(text='🔇 Музыка: Выкл')
@@ -681,14 +2738,14 @@ class HytaleApp:
             
         self.music_index = index
         path = self.music_files[index]
+        if not os.path.exists(path):
+            # Deleted since the last scan: drop it and play whatever took its place
+            self._apply_library_delta([], [path])
+            if self.music_files:
+                self._play_index(min(index, len(self.music_files) - 1), set_volume)
+            return
         
         try:
-            # Stop any currently playing music
-            pygame.mixer.music.stop()
-            
-            # Load the new track
-            pygame.mixer.music.load(path)
-            
             # Set volume (default to 21% if not specified)
             if set_volume is not None:
                 try:
@@ -698,12 +2755,9 @@ class HytaleApp:
             
             # Apply volume and start playback
             pygame.mixer.music.set_volume(self._volume)
-            pygame.mixer.music.play()
+            self.player.play(path)
             self._is_paused = False
             
-            # Update UI
-            self._update_ui_after_play()
-            
             # Update volume display if player window is open
             if hasattr(self, '_player_vol_scale'):
                 self._player_vol_scale.set(int(self._volume * 100))
@@ -714,17 +2768,31 @@ class HytaleApp:
             print(f'Playback error: {e}')
             self.status_bar.config(text=f'Ошибка воспроизведения: {str(e)}')
     
-    def _update_ui_after_play(self):
-        """Update UI elements after changing tracks"""
-        if hasattr(self, '_player_play_button'):
-            self._player_play_button.config(text='⏸')
-        
-        if hasattr(self, '_player_lbl') and self.music_files:
-            self._player_lbl.config(text=os.path.basename(self.music_files[self.music_index]))
-        
-        # Update listbox selection
-        if hasattr(self, '_player_listbox_all'):
-            self._select_current_in_lists()
+    def _next_track(self, path):
+        """Track the engine queues after path: the next one in the playlist, wrapping around."""
+        if not self.music_files:
+            return None
+        index = self.playlist.index_of(path)
+        return self.music_files[0 if index is None else (index + 1) % len(self.music_files)]
+
+    def _on_track_changed(self, path):
+        index = self.playlist.index_of(path)
+        if index is not None:
+            self.music_index = index
+        self.status_bar.config(text=f'Воспроизведение: {self._track_title(path)}')
+
+    def _on_player_paused(self, paused):
+        self._is_paused = paused
+        if self.player.current is not None:
+            self.status_bar.config(text='Пауза' if paused else f'Воспроизведение: {self._track_title(self.player.current)}')
+
+    def _pump_player(self):
+        """The one timer driving the player: mixer events, transitions and position updates."""
+        try:
+            self.player.pump()
+        except Exception as e:
+            print(f'Player pump error: {e}')
+        self.root.after(PLAYER_PUMP_MS, self._pump_player)
 
     def _play_next(self):
         if not self.music_files: return
@@ -736,29 +2804,18 @@ class HytaleApp:
         self.music_index = (self.music_index - 1) % len(self.music_files)
         self._play_index(self.music_index)
 
-    def _toggle_play_pause(self, btn=None):
+    def _toggle_play_pause(self):
         if not self.pygame_available or not self.music_files:
             return
             
         try:
-            if self._is_paused:
-                # If paused, unpause
-                pygame.mixer.music.unpause()
-                self._is_paused = False
-                if btn:
-                    btn.config(text='⏸')
-                self.status_bar.config(text='Воспроизведение')
+            if self.player.current is None:
+                # If stopped, start playing current track
+                self._play_index(self.music_index)
+            elif self._is_paused:
+                self.player.unpause()
             else:
-                # If playing, pause
-                if pygame.mixer.music.get_busy():
-                    pygame.mixer.music.pause()
-                    self._is_paused = True
-                    if btn:
-                        btn.config(text='▶')
-                    self.status_bar.config(text='Пауза')
-                else:
-                    # If stopped, start playing current track
-                    self._play_index(self.music_index)
+                self.player.pause()
         except Exception as e:
             print(f'Error in _toggle_play_pause: {e}')
             self.status_bar.config(text=f'Ошибка: {str(e)}')
@@ -778,7 +2835,7 @@ class HytaleApp:
         w.configure(bg=self.colors['bg'])
 
         # Track name label
-        track_lbl = tk.Label(w, text=os.path.basename(self.music_files[self.music_index]),
+        track_lbl = tk.Label(w, text=self._track_title(self.music_files[self.music_index]),
                             bg=self.colors['card_bg'], fg=self.colors['text'], font=('Cinzel', 13, 'bold'))
         track_lbl.pack(fill='x', padx=8, pady=(8, 4))
 
@@ -786,40 +2843,23 @@ class HytaleApp:
         btn_frame = tk.Frame(w, bg=self.colors['card_bg'])
         btn_frame.pack(pady=6)
 
-        def on_prev():
-            self._play_prev()
-            track_lbl.config(text=os.path.basename(self.music_files[self.music_index]))
-            _refresh_lists()
-
-        def on_play_pause():
-            self._toggle_play_pause(play_btn)
-            track_lbl.config(text=os.path.basename(self.music_files[self.music_index]))
-
-        def on_next():
-            self._play_next()
-            track_lbl.config(text=os.path.basename(self.music_files[self.music_index]))
-            _refresh_lists()
-
-        tk.Button(btn_frame, text='⏮', command=on_prev, bg=self.colors['card_bg'],
+        tk.Button(btn_frame, text='⏮', command=self._play_prev, bg=self.colors['card_bg'],
                  fg=self.colors['text'], width=3, font=('Arial', 11, 'bold'), relief='flat').pack(side='left', padx=4)
 
-        play_btn = tk.Button(btn_frame, text='⏸', command=on_play_pause, bg=self.colors['accent'],
+        play_btn = tk.Button(btn_frame, text='▶' if self._is_paused else '⏸', command=self._toggle_play_pause, bg=self.colors['accent'],
                             fg='#111', width=4, font=('Arial', 12, 'bold'), relief='flat')
         play_btn.pack(side='left', padx=4)
 
-        tk.Button(btn_frame, text='⏭', command=on_next, bg=self.colors['card_bg'],
+        tk.Button(btn_frame, text='⏭', command=self._play_next, bg=self.colors['card_bg'],
                  fg=self.colors['text'], width=3, font=('Arial', 11, 'bold'), relief='flat').pack(side='left', padx=4)
 
         # Favorite button
         def toggle_fav():
             if self.music_files:
                 path = self.music_files[self.music_index]
-                if path in self.favorites:
-                    self.favorites.remove(path)
-                else:
-                    self.favorites.add(path)
+                is_fav = self.playlist.toggle_favorite(path)
                 self._save_favorites()
-                fav_btn.config(text='★' if path in self.favorites else '☆')
+                fav_btn.config(text='★' if is_fav else '☆')
                 _refresh_lists()
 
         fav_btn = tk.Button(btn_frame, text='★' if self.music_files and self.music_files[self.music_index] in self.favorites else '☆',
@@ -835,6 +2875,11 @@ class HytaleApp:
         left_frame = tk.Frame(main_frame, bg=self.colors['card_bg'])
         left_frame.pack(side='left', fill='y', padx=(0, 8))
 
+        search_var = tk.StringVar()
+        search_entry = tk.Entry(left_frame, textvariable=search_var, bg=self.colors['video_bg'], fg=self.colors['text'],
+                                insertbackground=self.colors['text'], relief='flat')
+        search_entry.pack(fill='x', padx=4, pady=(4, 0))
+
         notebook = ttk.Notebook(left_frame)
         notebook.pack(fill='both', expand=True, padx=4, pady=4)
 
@@ -851,39 +2896,47 @@ class HytaleApp:
                                 highlightthickness=0, bd=0, activestyle='none')
         listbox_fav.pack(fill='both', expand=True, padx=4, pady=4)
 
+        # Paths behind each listbox row and the row texts currently shown, for diffing
+        views = {listbox_all: ([], []), listbox_fav: ([], [])}
+
+        def _show(lb, paths, rows):
+            shown_paths, shown_rows = views[lb]
+            sync_listbox(lb, shown_rows, rows)
+            shown_paths[:] = paths
+            shown_rows[:] = rows
+
         def _refresh_lists():
-            listbox_all.delete(0, tk.END)
-            listbox_fav.delete(0, tk.END)
-            for path in self.music_files:
-                name = os.path.basename(path)
-                display = f"★ {name}" if path in self.favorites else name
-                listbox_all.insert(tk.END, display)
-                if path in self.favorites:
-                    listbox_fav.insert(tk.END, name)
+            matches = self.playlist.search(search_var.get())
+            paths = self.music_files if matches is None else [p for p in self.music_files if p in matches]
+            favs = self.playlist.favorite_tracks()
+            if matches is not None:
+                favs = [p for p in favs if p in matches]
+            _show(listbox_all, list(paths),
+                  [f"★ {os.path.basename(p)}" if p in self.favorites else os.path.basename(p) for p in paths])
+            _show(listbox_fav, list(favs), [os.path.basename(p) for p in favs])
 
         def _on_listbox_play(event, lb):
             sel = lb.curselection()
             if not sel:
                 return
-            idx = sel[0]
-            if lb is listbox_all:
-                self.music_index = idx
-            else:
-                # Find by name in fav
-                name = lb.get(idx)
-                for i, p in enumerate(self.music_files):
-                    if os.path.basename(p) == name:
-                        self.music_index = i
-                        break
+            index = self.playlist.index_of(views[lb][0][sel[0]])
+            if index is None:
+                return
+            self.music_index = index
             self._play_index(self.music_index)
-            track_lbl.config(text=os.path.basename(self.music_files[self.music_index]))
-            fav_btn.config(text='★' if self.music_files[self.music_index] in self.favorites else '☆')
-            _refresh_lists()
 
         listbox_all.bind('<Double-Button-1>', lambda e: _on_listbox_play(e, listbox_all))
         listbox_fav.bind('<Double-Button-1>', lambda e: _on_listbox_play(e, listbox_fav))
+        search_var.trace_add('write', lambda *a: _refresh_lists())
         _refresh_lists()
 
+        def _on_library_changed():
+            _refresh_lists()
+            if self.music_files:
+                track_lbl.config(text=self._track_title(self.music_files[self.music_index]))
+        self._library_listeners.append(_on_library_changed)
+        w.bind('<Destroy>', lambda e: e.widget is w and self._library_listeners.remove(_on_library_changed), add='+')
+
         # RIGHT: Controls
         right_frame = tk.Frame(main_frame, bg=self.colors['card_bg'])
         right_frame.pack(side='left', fill='both', expand=True)
@@ -937,39 +2990,46 @@ class HytaleApp:
                 pct = seek_var.get() / 1000.0
                 self._seek_to_pct(pct)
 
+        def _on_seek_drag(value):
+            # Scrub while dragging; _seek_to_pct coalesces the moves
+            if seek_dragging[0]:
+                pct = float(value) / 1000.0
+                time_left.config(text=self._ms_to_str(int(pct * self._get_current_length_ms())))
+                self._seek_to_pct(pct)
+
         seek_scale.bind('<ButtonPress-1>', _on_seek_press)
         seek_scale.bind('<ButtonRelease-1>', _on_seek_release)
+        seek_scale.config(command=_on_seek_drag)
 
-        def _update_ui():
+        def _on_position(pos_ms):
             """Update seek bar and time labels."""
-            if seek_dragging[0]:
-                w.after(200, _update_ui)
+            if seek_dragging[0] or self._seek_job is not None:
                 return
-
             length_ms = self._get_current_length_ms()
-            pos_ms = 0
-
-            try:
-                if self.pygame_available and pygame.mixer.music.get_busy():
-                    pos_ms = int(pygame.mixer.music.get_pos() or 0)
-            except:
-                pass
-
             if length_ms > 0:
-                pct = (pos_ms / length_ms) * 1000
-                seek_var.set(min(max(int(pct), 0), 1000))
+                seek_var.set(min(max(int(pos_ms / length_ms * 1000), 0), 1000))
                 time_left.config(text=self._ms_to_str(pos_ms))
                 time_right.config(text=self._ms_to_str(length_ms))
 
-                # Auto-advance near end
-                if pos_ms > 0 and (length_ms - pos_ms) < 500:
-                    self._play_next()
-                    track_lbl.config(text=os.path.basename(self.music_files[self.music_index]))
-                    _refresh_lists()
+        def _on_track_changed(path):
+            track_lbl.config(text=self._track_title(path))
+            fav_btn.config(text='★' if path in self.favorites else '☆')
+            _on_position(0)
+
+        def _on_paused(paused):
+            play_btn.config(text='▶' if paused else '⏸')
 
-            w.after(200, _update_ui)
+        subscriptions = [('position', _on_position), ('track_changed', _on_track_changed), ('paused', _on_paused)]
+        for event, callback in subscriptions:
+            self.player.subscribe(event, callback)
 
-        _update_ui()
+        def _on_destroy(e):
+            if e.widget is w:
+                for event, callback in subscriptions:
+                    self.player.unsubscribe(event, callback)
+        w.bind('<Destroy>', _on_destroy, add='+')
+        if self.player.current is not None:
+            _on_position(self.player.position())
 
     def _ms_to_str(self, ms):
         """Convert milliseconds to 'MM:SS' format."""
@@ -980,17 +3040,22 @@ class HytaleApp:
         return f'{m:02}:{s:02}'
 
     def _get_current_length_ms(self):
-        """Get current track length in milliseconds using mutagen."""
-        try:
-            if not self.music_files:
-                return 0
-            path = self.music_files[self.music_index]
-            audio = MutagenFile(path)
-            if audio and getattr(audio, 'info', None):
-                return int(audio.info.length * 1000)
-        except Exception:
-            pass
-        return 0
+        """Get current track length in milliseconds from the track index."""
+        if not self.music_files:
+            return 0
+        return self.track_index.duration_ms(self.music_files[self.music_index])
+
+    def _track_search_text(self, path):
+        """File name plus title/artist tags, for the playlist search index."""
+        entry = self.track_index.get(path) or {}
+        return ' '.join(filter(None, (os.path.splitext(os.path.basename(path))[0], entry.get('title'), entry.get('artist'))))
+
+    def _track_title(self, path):
+        """'Artist — Title' from the track index, falling back to the file name."""
+        entry = self.track_index.get(path) or {}
+        if entry.get('title'):
+            return f"{entry['artist']} — {entry['title']}" if entry.get('artist') else entry['title']
+        return os.path.basename(path)
 
     def _get_volume_percent(self):
         """Get current volume as percentage."""
@@ -1020,37 +3085,24 @@ class HytaleApp:
             print(f'Volume error: {e}')
 
     def _seek_to_pct(self, pct):
-        """Seek to position (0-1 percentage of track)."""
-        if not self.pygame_available or not self.music_files:
+        """Seek to position (0-1 percentage of track); calls in quick succession make one seek."""
+        if self._seek_job is not None:
+            self.root.after_cancel(self._seek_job)
+        self._seek_job = self.root.after(SEEK_DEBOUNCE_MS, lambda: self._apply_seek(pct))
+
+    def _apply_seek(self, pct):
+        self._seek_job = None
+        if not self.pygame_available or not self.music_files or self.player.current is None:
             return
 
         try:
             length_ms = self._get_current_length_ms()
             if length_ms <= 0:
                 return
-
-            pos_sec = (pct * length_ms) / 1000.0
-
-            try:
-                # Stop current playback
-                pygame.mixer.music.stop()
-                # Load and seek
-                pygame.mixer.music.load(self.music_files[self.music_index])
-                pygame.mixer.music.play(loops=0, start=pos_sec)
-                
-                # Restore state
-                pygame.mixer.music.set_volume(self._volume)
-                if self._is_paused:
-                    pygame.mixer.music.pause()
-
-                self.status_bar.config(text=f'Перемотка: {self._ms_to_str(int(pct * length_ms))}')
-            except Exception as e:
-                print(f'Seek error: {e}')
+            self.player.seek((pct * length_ms) / 1000.0)
+            self.status_bar.config(text=f'Перемотка: {self._ms_to_str(int(pct * length_ms))}')
         except Exception as e:
-            print(f'Error in _seek_to_pct: {e}')
-
-    def clear_frame(self, frame):
-        for w in frame.winfo_children(): w.destroy()
+            print(f'Seek error: {e}')
 
     def add_item(self, container, text, url, color, is_youtube=False, youtube_id=None):
         row = tk.Frame(container, bg=self.colors['card_bg'])
@@ -1061,29 +3113,30 @@ class HytaleApp:
             normalized_url = normalize_youtube_url(url)
             thumb_label = tk.Label(row, text='Загрузка превью...', bg=self.colors['card_bg'], fg=self.colors['date'])
             thumb_label.pack(side='left', padx=(4,8))
-                                                        
-            def load_thumb():
-                try:
-                    if not vid:
-                        raise ValueError('ID отсутствует')
-                    thumb_url = f'https://img.youtube.com/vi/{vid}/hqdefault.jpg'
-                    r = requests.get(thumb_url, timeout=8)
-                    r.raise_for_status()
-                    img = Image.open(BytesIO(r.content)).convert('RGBA')
-                    target_h = 84
-                    w = int(img.width * (target_h / img.height))
-                    img = img.resize((w, target_h), Image.Resampling.LANCZOS)
-                    ph = ImageTk.PhotoImage(img)
-                    def set_ui():
-                        thumb_label.config(image=ph, text='')
-                        thumb_label.image = ph
-                        self.image_refs.append(ph)
-                    self.root.after(0, set_ui)
-                except Exception as e:
-                    def err():
-                        thumb_label.config(text='❌', fg='#ff6b6b')
-                    self.root.after(0, err)
-            threading.Thread(target=load_thumb, daemon=True).start()
+            thumb_url = youtube_thumb_url(vid, int(THUMB_VARIANT[1:])) if vid else None
+            cached = self.photo_cache.get((thumb_url, THUMB_VARIANT), owner=row) if thumb_url else None
+            if cached is not None:
+                thumb_label.config(image=cached, text='')
+                thumb_label.image = cached
+            else:
+                def load_thumb():
+                    try:
+                        if not vid:
+                            raise ValueError('ID отсутствует')
+                        img = self._load_image(thumb_url, THUMB_VARIANT, timeout=8)
+                        def set_ui():
+                            if not row.winfo_exists():
+                                return
+                            ph = self.photo_cache.put((thumb_url, THUMB_VARIANT), img, owner=row)
+                            thumb_label.config(image=ph, text='')
+                            thumb_label.image = ph
+                        self.ui.post(set_ui)
+                    except Exception as e:
+                        def err():
+                            if row.winfo_exists():
+                                thumb_label.config(text='❌', fg='#ff6b6b')
+                        self.ui.post(err)
+                threading.Thread(target=load_thumb, daemon=True).start()
 
             txt_frame = tk.Frame(row, bg=self.colors['card_bg'])
             txt_frame.pack(fill='x', expand=True, side='left')
@@ -1098,11 +3151,13 @@ class HytaleApp:
             lbl = tk.Label(row, text=text, font=('Arial', 11), fg=color, bg=self.colors['card_bg'], cursor='hand2', wraplength=740, justify='left')
             lbl.pack(fill='x', padx=6, pady=6)
             lbl.bind('<Button-1>', lambda e: self.open_in_app_viewer(url, text, is_youtube=False))
+        return row
 
     def add_error(self, container, msg):
         tk.Label(container, text=f'⚠️ {msg}', fg='#ff6b6b', bg=self.colors['card_bg'], font=('Arial', 9)).pack(anchor='w', padx=8, pady=4)
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # image decode workers in the frozen (PyInstaller) build
     root = tk.Tk()
     app = HytaleApp(root)
     root.mainloop()